@@ -0,0 +1,561 @@
+"""
+Scaling benchmark for the РГР (raw SQL) and ЛАБА2 (SQLAlchemy) models.
+
+For every scale factor (number of objects) the database is topped up with the
+models' own generate_* methods, then read / update_*_field / delete_* / search_*
+are timed and throughput plus p50/p95/p99 latency are written to a JSON file.
+
+Both projects import their code as the package "src", so every (project, scale)
+pair runs in its own subprocess. Tables are created by the ЛАБА2 model
+(Base.metadata.create_all), so it runs first by default.
+
+--data-seed passes a seed to generate_* where the model accepts one (РГР), so
+a run that lets РГР populate gives the same dataset every time; each result
+carries the dataset fingerprint so runs on different data are easy to spot.
+
+    python benchmark.py --scales 10000 100000 --output bench_results.json
+    python benchmark.py --projects РГР ЛАБА2 --data-seed 42 --scales 100000
+    python benchmark.py --compare old.json new.json
+
+--engines times the РГР generation engines instead ("sql": INSERT ... SELECT
+with random() on the server, "numpy": client-side batches sent with COPY) on
+the current data and prints rows/s per table, to pick the faster one per table.
+
+    python benchmark.py --engines --engine-rows 200000 --output engines.json
+
+--async compares РГР's sync Model (one thread, then --concurrency threads)
+with AsyncModel (--concurrency queries in flight on one event loop) on the
+same mix of searches and point updates, in operations per second.
+
+    python benchmark.py --async --concurrency 16 --async-ops 2000 --output async.json
+
+--orm-read times ЛАБА2's read() of the joined tables with every read strategy
+("columns": only the printed columns in one joined SELECT, "eager": entities
+with the relationships filled from that SELECT, "entities": entities with lazy
+loaded relationships, the original path) on the current data; populate first,
+e.g. with --projects ЛАБА2 --scales 1000000.
+
+    python benchmark.py --orm-read --read-samples 3 --output orm_read.json
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import platform
+import random
+import statistics
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PROJECTS = ("ЛАБА2", "РГР")
+DEFAULT_SCALES = (10_000, 100_000, 1_000_000, 10_000_000)
+
+SEARCH_ARGS = {
+    "search_researchers": [("A", "-"), ("-", "Lead"), ("AB", "Senior")],
+    "search_objects": [("A", "-"), ("-", "AB"), ("AB", "A")],
+    "search_labs": [("-", "Lead", "-"), ("AB", "-", "-"), ("-", "-", "ABC")],
+    "search_objects_by_distance": [(100, 1000), ("1 тис. св.р.", "1 млн св.р."), (4.2, 4.3)],
+    "search_nearest_objects": [(4.2, 50), ("1.3 пк", 10), (1e8, 50)],
+}
+
+ENGINE_TABLES = ("object_type", "researcher", "object")
+
+ORM_READ_TABLES = ("researcher", "object")
+
+UPDATE_FIELDS = {
+    "laboratory": ("lab_name",),
+    "researcher": ("full_name", "level", "laboratory_id"),
+    "object_type": ("type", "galaxy_location"),
+    "object": ("name", "distance", "laboratory_id", "type_id"),
+}
+
+
+# ======== DATASET SIZE ========
+
+def targets_for(scale: int) -> dict:
+    # rows per table for a given number of objects
+    return {
+        "laboratory": min(max(scale // 10_000, 10), 1_000),
+        "object_type": min(max(scale // 100_000, 5), 100),
+        "researcher": max(scale // 10, 100),
+        "object": scale,
+    }
+
+
+# ======== MEASUREMENT ========
+
+def summarize(latencies: list) -> dict:
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    if len(latencies) > 1:
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = percentiles[49], percentiles[94], percentiles[98]
+    else:
+        p50 = p95 = p99 = latencies[0]
+    return {
+        "samples": len(latencies),
+        "throughput_ops_s": len(latencies) / total if total > 0 else None,
+        "mean_ms": total / len(latencies) * 1000,
+        "p50_ms": p50 * 1000,
+        "p95_ms": p95 * 1000,
+        "p99_ms": p99 * 1000,
+    }
+
+
+def timed(calls) -> dict:
+    # calls: iterable of zero-argument callables, each timed separately
+    latencies = []
+    for call in calls:
+        t0 = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies)
+
+
+def random_name(length=5) -> str:
+    return "".join(random.choices(string.ascii_uppercase, k=length))
+
+
+# ======== WORKER (runs inside one project) ========
+
+def quiet_logs():
+    # the models log every write at SUCCESS / INFO straight to stdout; keep the
+    # benchmark output (and timings) to warnings and errors
+    from src.log import configure
+    configure(level="WARNING", sql_sample=0)
+
+
+def make_model(model_class):
+    # benchmark the database, not the РГР result cache
+    if "cache_bytes" in inspect.signature(model_class).parameters:
+        return model_class(cache_bytes=0)
+    return model_class()
+
+
+def count_rows(model, table_name) -> int:
+    return model._execute_select(f"SELECT count(*) FROM {table_name}")[0][0]
+
+
+def ids_of(model, table_name) -> list:
+    return [row[0] for row in model._execute_select(f"SELECT id FROM {table_name}")]
+
+
+def populate(model, scale: int, seed=None) -> dict:
+    generators = {
+        "laboratory": model.generate_laboratories,
+        "object_type": model.generate_object_types,
+        "researcher": model.generate_researchers,
+        "object": model.generate_objects,
+    }
+    report = {}
+    for table_name, target in targets_for(scale).items():
+        missing = target - count_rows(model, table_name)
+        if missing <= 0:
+            continue
+        generate = generators[table_name]
+        t0 = time.perf_counter()
+        if seed is not None and "seed" in inspect.signature(generate).parameters:
+            inserted = generate(missing, seed=seed)
+        else:
+            inserted = generate(missing)
+        seconds = time.perf_counter() - t0
+        report[table_name] = {
+            "rows": inserted,
+            "seconds": seconds,
+            "rows_s": inserted / seconds if seconds > 0 else None,
+        }
+    return report
+
+
+def bench_operations(model, args) -> dict:
+    lab_ids = ids_of(model, "laboratory")
+    type_ids = ids_of(model, "object_type")
+    max_ids = {
+        table_name: model._execute_select(f"SELECT max(id) FROM {table_name}")[0][0]
+        for table_name in UPDATE_FIELDS
+    }
+    values = {
+        "lab_name": lambda: f"BENCH-{random_name(8)}",
+        "full_name": random_name,
+        "name": random_name,
+        "level": lambda: random.choice(("Junior", "Middle", "Senior", "Lead")),
+        "laboratory_id": lambda: random.choice(lab_ids),
+        "type_id": lambda: random.choice(type_ids),
+        "type": random_name,
+        "galaxy_location": random_name,
+        "distance": lambda: random.randint(1_000, 1_000_000_000),
+    }
+    updaters = {
+        "laboratory": lambda record_id, field, value: model.update_laboratory_field(record_id, value),
+        "researcher": model.update_researcher_field,
+        "object_type": model.update_object_type_field,
+        "object": model.update_object_field,
+    }
+
+    results = {}
+
+    # --- read ---
+    for table_name in UPDATE_FIELDS:
+        if count_rows(model, table_name) > args.max_read_rows:
+            results[f"read_{table_name}"] = {"skipped": f"more than {args.max_read_rows} rows"}
+            continue
+        results[f"read_{table_name}"] = timed(
+            (lambda t=table_name: model.read(t)) for _ in range(args.read_samples)
+        )
+
+    # --- update_*_field ---
+    for table_name, fields in UPDATE_FIELDS.items():
+        for field in fields:
+            results[f"update_{table_name}_{field}"] = timed(
+                (lambda t=table_name, f=field: updaters[t](random.randint(1, max_ids[t]), f, values[f]()))
+                for _ in range(args.samples)
+            )
+
+    # --- delete_* (on scratch rows created for the purpose) ---
+    scratch = {
+        "laboratory": lambda i: model.create_laboratory(f"BENCH-DEL-{i}-{random_name(8)}"),
+        "object_type": lambda i: model.create_object_type("BENCHDEL", "BENCHDEL"),
+        "researcher": lambda i: model.create_researcher("BENCHDEL", "Junior", lab_ids[0]),
+        "object": lambda i: model.create_object("BENCHDEL", 1000, lab_ids[0], type_ids[0]),
+    }
+    scratch_filter = {
+        "laboratory": "lab_name LIKE 'BENCH-DEL-%%'",
+        "object_type": "type = 'BENCHDEL'",
+        "researcher": "full_name = 'BENCHDEL'",
+        "object": "name = 'BENCHDEL'",
+    }
+    deleters = {
+        "laboratory": model.delete_laboratory,
+        "object_type": model.delete_object_type,
+        "researcher": model.delete_researcher,
+        "object": model.delete_object,
+    }
+    for table_name in UPDATE_FIELDS:
+        for i in range(args.samples):
+            scratch[table_name](i)
+        doomed = [row[0] for row in model._execute_select(
+            f"SELECT id FROM {table_name} WHERE {scratch_filter[table_name]}"
+        )]
+        results[f"delete_{table_name}"] = timed(
+            (lambda t=table_name, record_id=record_id: deleters[t](record_id)) for record_id in doomed
+        )
+
+    # --- search_* ---
+    for search_name, arg_sets in SEARCH_ARGS.items():
+        search = getattr(model, search_name)
+        results[search_name] = timed(
+            (lambda a=arg_sets[i % len(arg_sets)]: search(*a)) for i in range(args.search_samples)
+        )
+
+    return results
+
+
+def run_worker(args):
+    sys.path.insert(0, os.path.join(ROOT, args.project))
+    from src.model import Model
+
+    quiet_logs()
+
+    random.seed(args.random_seed)
+    model = make_model(Model)
+    generation = populate(model, args.scale, args.data_seed) if args.populate else {}
+    counts = {table_name: count_rows(model, table_name) for table_name in UPDATE_FIELDS}
+    # identifies the data the timings were taken on (before the operations modify it)
+    fingerprint = model.dataset_fingerprint() if hasattr(model, "dataset_fingerprint") else None
+    operations = bench_operations(model, args)
+    model.disconnect()
+
+    result = {
+        "project": args.project,
+        "scale": args.scale,
+        "rows": counts,
+        "fingerprint": fingerprint,
+        "generation": generation,
+        "operations": operations,
+    }
+    with open(args.worker_output, "w", encoding="utf-8") as out:
+        json.dump(result, out, ensure_ascii=False)
+
+
+# ======== RUNNER ========
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_benchmark(args):
+    report = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "host": platform.node(),
+            "samples": args.samples,
+            "search_samples": args.search_samples,
+            "read_samples": args.read_samples,
+            "data_seed": args.data_seed,
+        },
+        "results": [],
+    }
+
+    for scale in sorted(args.scales):
+        for index, project in enumerate(args.projects):
+            print(f"[BENCH] {project}: {scale:,} objects...", flush=True)
+            with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
+                worker_output = tmp.name
+            command = [
+                sys.executable, os.path.abspath(__file__), "--worker",
+                "--project", project,
+                "--scale", str(scale),
+                "--worker-output", worker_output,
+                "--samples", str(args.samples),
+                "--search-samples", str(args.search_samples),
+                "--read-samples", str(args.read_samples),
+                "--max-read-rows", str(args.max_read_rows),
+                "--random-seed", str(args.random_seed),
+            ]
+            if args.data_seed is not None:
+                command += ["--data-seed", str(args.data_seed)]
+            if index == 0:
+                command.append("--populate")
+            subprocess.run(command, check=True)
+            with open(worker_output, encoding="utf-8") as worker_result:
+                report["results"].append(json.load(worker_result))
+            os.remove(worker_output)
+
+            with open(args.output, "w", encoding="utf-8") as out:
+                json.dump(report, out, ensure_ascii=False, indent=2)
+
+    print(f"[BENCH] Results written to {args.output}")
+
+
+def run_engines(args):
+    # РГР only: each engine generates engine_rows rows per table, which are then
+    # deleted again so every run starts from the same table sizes
+    sys.path.insert(0, os.path.join(ROOT, "РГР"))
+    from src.model import Model
+    from src.generation import GENERATION_ENGINES
+    quiet_logs()
+
+    model = make_model(Model)
+    generators = {
+        "object_type": model.generate_object_types,
+        "researcher": model.generate_researchers,
+        "object": model.generate_objects,
+    }
+
+    results = []
+    print(f"{'table':12} {'engine':8} {'rows':>10} {'seconds':>9} {'rows/s':>10}")
+    for table_name in ENGINE_TABLES:
+        for engine in GENERATION_ENGINES:
+            last_id = model._execute_select(f"SELECT COALESCE(max(id), 0) FROM {table_name}")[0][0]
+            t0 = time.perf_counter()
+            inserted = generators[table_name](args.engine_rows, engine=engine, seed=args.data_seed)
+            seconds = time.perf_counter() - t0
+            model._execute_modify(f"DELETE FROM {table_name} WHERE id > %s", (last_id,))
+            rows_s = inserted / seconds if seconds > 0 else None
+            results.append({
+                "table": table_name, "engine": engine, "rows": inserted, "seconds": seconds, "rows_s": rows_s,
+            })
+            print(f"{table_name:12} {engine:8} {inserted:>10,} {seconds:>9.2f} {rows_s or 0:>10,.0f}")
+    model.disconnect()
+
+    report = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "host": platform.node(),
+            "engine_rows": args.engine_rows,
+            "data_seed": args.data_seed,
+        },
+        "engines": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as out:
+        json.dump(report, out, ensure_ascii=False, indent=2)
+    print(f"[BENCH] Results written to {args.output}")
+
+
+def run_orm_read(args):
+    # ЛАБА2 only: read() of the tables that print related columns, once per strategy
+    sys.path.insert(0, os.path.join(ROOT, "ЛАБА2"))
+    from src.model import Model, READ_STRATEGIES
+    quiet_logs()
+
+    model = make_model(Model)
+
+    results = []
+    print(f"{'table':12} {'strategy':10} {'rows':>10} {'p50 ms':>10} {'rows/s':>12}")
+    for table_name in ORM_READ_TABLES:
+        rows = count_rows(model, table_name)
+        for strategy in READ_STRATEGIES:
+            stats = timed(
+                (lambda t=table_name, s=strategy: model.read(t, strategy=s)) for _ in range(args.read_samples)
+            )
+            rows_s = rows / (stats["p50_ms"] / 1000) if stats["p50_ms"] > 0 else None
+            results.append({"table": table_name, "strategy": strategy, "rows": rows, "rows_s": rows_s, **stats})
+            print(f"{table_name:12} {strategy:10} {rows:>10,} {stats['p50_ms']:>10.1f} {rows_s or 0:>12,.0f}")
+    model.disconnect()
+
+    report = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "host": platform.node(),
+            "read_samples": args.read_samples,
+        },
+        "orm_read": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as out:
+        json.dump(report, out, ensure_ascii=False, indent=2)
+    print(f"[BENCH] Results written to {args.output}")
+
+
+def async_workload(object_ids, n: int) -> list:
+    # (method name, args): searches from SEARCH_ARGS interleaved with point updates
+    searches = [(name, args) for name, variants in SEARCH_ARGS.items() for args in variants]
+    operations = []
+    for i in range(n):
+        if i % 2:
+            operations.append(("update_object_field", (random.choice(object_ids), "name", random_name())))
+        else:
+            operations.append(searches[(i // 2) % len(searches)])
+    return operations
+
+
+def run_async_comparison(args):
+    sys.path.insert(0, os.path.join(ROOT, "РГР"))
+    from src.model import Model
+    from src.async_model import AsyncModel
+    quiet_logs()
+
+    random.seed(args.random_seed)
+    model = Model(max_connections=args.concurrency, cache_bytes=0)
+    operations = async_workload(ids_of(model, "object"), args.async_ops)
+
+    def call(operation):
+        name, call_args = operation
+        return getattr(model, name)(*call_args)
+
+    async def run_async():
+        async with AsyncModel(max_connections=args.concurrency) as async_model:
+            t0 = time.perf_counter()
+            await asyncio.gather(*(getattr(async_model, name)(*call_args) for name, call_args in operations))
+            return time.perf_counter() - t0
+
+    results = {}
+    t0 = time.perf_counter()
+    for operation in operations:
+        call(operation)
+    results["sync"] = time.perf_counter() - t0
+
+    with ThreadPoolExecutor(args.concurrency) as executor:
+        t0 = time.perf_counter()
+        list(executor.map(call, operations))
+        results[f"sync_threads_{args.concurrency}"] = time.perf_counter() - t0
+
+    results[f"async_{args.concurrency}"] = asyncio.run(run_async())
+    model.disconnect()
+
+    report_results = []
+    print(f"{'mode':20} {'operations':>10} {'seconds':>9} {'ops/s':>10}")
+    for mode, seconds in results.items():
+        ops_s = len(operations) / seconds if seconds > 0 else None
+        report_results.append({"mode": mode, "operations": len(operations), "seconds": seconds, "ops_s": ops_s})
+        print(f"{mode:20} {len(operations):>10,} {seconds:>9.2f} {ops_s or 0:>10,.0f}")
+
+    report = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "host": platform.node(),
+            "concurrency": args.concurrency,
+            "async_ops": args.async_ops,
+        },
+        "async": report_results,
+    }
+    with open(args.output, "w", encoding="utf-8") as out:
+        json.dump(report, out, ensure_ascii=False, indent=2)
+    print(f"[BENCH] Results written to {args.output}")
+
+
+def compare(old_path, new_path):
+    # p50 latency ratio new/old per (project, scale, operation); > 1 means slower
+    def index(path):
+        with open(path, encoding="utf-8") as f:
+            report = json.load(f)
+        return {
+            (r["project"], r["scale"], name): stats
+            for r in report["results"]
+            for name, stats in r["operations"].items()
+            if "p50_ms" in stats
+        }
+
+    old, new = index(old_path), index(new_path)
+    print(f"{'project':8} {'scale':>12} {'operation':40} {'old p50 ms':>12} {'new p50 ms':>12} {'ratio':>7}")
+    for key in sorted(old.keys() & new.keys()):
+        project, scale, name = key
+        ratio = new[key]["p50_ms"] / old[key]["p50_ms"] if old[key]["p50_ms"] else float("inf")
+        flag = "  <-- slower" if ratio > 1.2 else ""
+        print(f"{project:8} {scale:>12,} {name:40} {old[key]['p50_ms']:>12.3f} {new[key]['p50_ms']:>12.3f} {ratio:>7.2f}{flag}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", nargs="+", default=list(PROJECTS), choices=PROJECTS)
+    parser.add_argument("--scales", nargs="+", type=int, default=list(DEFAULT_SCALES))
+    parser.add_argument("--samples", type=int, default=200, help="calls per update/delete operation")
+    parser.add_argument("--search-samples", type=int, default=9, help="calls per search operation")
+    parser.add_argument("--read-samples", type=int, default=3, help="calls per table read")
+    parser.add_argument("--max-read-rows", type=int, default=1_000_000, help="skip read() of larger tables")
+    parser.add_argument("--random-seed", type=int, default=1, help="seed for the ids and values used by operations")
+    parser.add_argument("--data-seed", type=int, default=None,
+                        help="seed for generate_* (reproducible dataset where the model supports it)")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    parser.add_argument("--engines", action="store_true", help="compare the РГР generation engines")
+    parser.add_argument("--engine-rows", type=int, default=100_000, help="rows per table and engine for --engines")
+    parser.add_argument("--async", dest="async_mode", action="store_true",
+                        help="compare the РГР sync and asyncio models")
+    parser.add_argument("--orm-read", action="store_true", help="compare the ЛАБА2 read() strategies")
+    parser.add_argument("--concurrency", type=int, default=16, help="threads / in-flight queries for --async")
+    parser.add_argument("--async-ops", type=int, default=1000, help="operations per mode for --async")
+
+    # internal: one (project, scale) run
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--project", help=argparse.SUPPRESS)
+    parser.add_argument("--scale", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--populate", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    if arguments.compare:
+        compare(*arguments.compare)
+    elif arguments.engines:
+        run_engines(arguments)
+    elif arguments.async_mode:
+        run_async_comparison(arguments)
+    elif arguments.orm_read:
+        run_orm_read(arguments)
+    elif arguments.worker:
+        run_worker(arguments)
+    else:
+        run_benchmark(arguments)
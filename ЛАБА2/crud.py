@@ -1,7 +1,21 @@
+import argparse
+
 from src.controller import Controller
+from src.log import configure
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Astronomy data CRUD (SQLAlchemy)")
+    parser.add_argument("--log-level", choices=("DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR"), type=str.upper,
+                        help="WARNING hides per-operation messages, DEBUG adds SQL statements (default: INFO)")
+    parser.add_argument("--sql-sample", type=float, metavar="SHARE",
+                        help="share of SQL statements logged at DEBUG, 0..1 (default: 1)")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
+    arguments = parse_args()
+    configure(arguments.log_level, arguments.sql_sample)
     controller = Controller()
     controller.run()
 
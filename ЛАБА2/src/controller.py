@@ -1,5 +1,6 @@
 ﻿from .model import Model
 from .view import View
+from .log import SUCCESS, log
 from functools import wraps
 from psycopg2.errors import StringDataRightTruncation
 
@@ -10,10 +11,10 @@ def catch_db_error(option):
         try:
             option(self, *args, **kwargs)
         except (IndexError, StringDataRightTruncation, ValueError, AssertionError) as e:
-            print(f"\n Known DB error: {type(e).__name__} — {e}\n")
+            log.error("Known DB error: %s — %s", type(e).__name__, e)
             self.view.output_error_message()
         except Exception as e:
-            print(f"\n Unexpected error in {option.__name__}: {type(e).__name__} — {e}\n")
+            log.error("Unexpected error in %s: %s — %s", option.__name__, type(e).__name__, e)
             self.view.output_error_message()
     return inner
 
@@ -55,6 +56,13 @@ class Controller:
                 "search_researchers": self.task3_search_researchers,
                 "search_objects": self.task3_search_objects,
                 "search_labs": self.task3_search_labs,
+                "search_distance_range": self.task3_search_distance_range,
+                "search_nearest": self.task3_search_nearest,
+            },
+            "transaction": {
+                "begin": self.transaction_begin,
+                "commit": self.transaction_commit,
+                "rollback": self.transaction_rollback,
             },
         }
         self.model = Model()
@@ -64,6 +72,8 @@ class Controller:
         while True:
             chosen_mode_viewer, chosen_mode = self.view.show_menu()
             if not chosen_mode_viewer:
+                if self.model.in_transaction():
+                    self.transaction_rollback(None)
                 self.model.disconnect()
                 break
             chosen_option_viewer, chosen_option = chosen_mode_viewer()
@@ -72,6 +82,31 @@ class Controller:
 
             self.available[chosen_mode][chosen_option](args_or_command)
 
+    # --- TRANSACTION (unit of work over several menu operations) ---
+    def transaction_begin(self, _):
+        if self.model.in_transaction():
+            self.view.output_transaction_state("open")
+            return
+        self.model.begin()
+        self.view.output_transaction_state("begin")
+
+    @catch_db_error
+    def transaction_commit(self, _):
+        if not self.model.in_transaction():
+            self.view.output_transaction_state("none")
+            return
+        tx = self.model.current_transaction()
+        committed = self.model.commit()
+        self.view.output_transaction_state("commit" if committed else "failed", tx.writes)
+
+    def transaction_rollback(self, _):
+        if not self.model.in_transaction():
+            self.view.output_transaction_state("none")
+            return
+        tx = self.model.current_transaction()
+        self.model.rollback()
+        self.view.output_transaction_state("rollback", tx.writes)
+
     # --- CREATE OPERATIONS ---
     @catch_db_error
     def create_laboratory(self, args):
@@ -123,9 +158,9 @@ class Controller:
         affected = self.model.update_laboratory_field(find_name, new_name)
 
         if affected == 0:
-            print(f"[!INFO!] NO LABORATORY WITH ID={find_name} — nothing was updated.")
+            log.info("No laboratory with id=%s — nothing was updated.", find_name)
         else:
-            print(f"[SUCCESS] Laboratory id={find_name} updated successfully (new name: {new_name})")
+            log.log(SUCCESS, "Laboratory id=%s updated successfully (new name: %s)", find_name, new_name)
    
     @catch_db_error
     def update_researcher(self, args):
@@ -147,9 +182,9 @@ class Controller:
         affected = self.model.update_researcher_field(researcher_id, field, new_value)
 
         if affected == 0:
-            print(f"[INFO] No researcher with id={researcher_id} — nothing was updated.")
+            log.info("No researcher with id=%s — nothing was updated.", researcher_id)
         else:
-            print(f"[SUCCESS] Researcher id={researcher_id} updated: set {field} = {new_value}")
+            log.log(SUCCESS, "Researcher id=%s updated: set %s = %s", researcher_id, field, new_value)
 
 
     @catch_db_error
@@ -171,9 +206,9 @@ class Controller:
         affected = self.model.update_object_field(object_id, field, new_value)
 
         if affected == 0:
-            print(f"[INFO] No object with id={object_id} — nothing was updated.")
+            log.info("No object with id=%s — nothing was updated.", object_id)
         else:
-            print(f"[SUCCESS] Object id={object_id} updated: set {field} = {new_value}")
+            log.log(SUCCESS, "Object id=%s updated: set %s = %s", object_id, field, new_value)
 
 
     @catch_db_error
@@ -192,9 +227,9 @@ class Controller:
         affected = self.model.update_object_type_field(type_id, field, new_value)
 
         if affected == 0:
-            print(f"[INFO] No object_type with id={type_id} — nothing was updated.")
+            log.info("No object_type with id=%s — nothing was updated.", type_id)
         else:
-            print(f"[SUCCESS] Object type id={type_id} updated: set {field} = {new_value}")
+            log.log(SUCCESS, "Object type id=%s updated: set %s = %s", type_id, field, new_value)
 
     # --- DELETE ---
     @catch_db_error
@@ -217,30 +252,30 @@ class Controller:
     def task_generate_labs(self, args):
         # args is n
         n = int(args)
-        print(f"[TASK2] Generating {n} laboratories...")
+        log.info("Generating %s laboratories...", n)
         created = self.model.generate_laboratories(n)
-        print(f"[TASK2] Laboratories inserted (approx): {created}")
+        log.info("Laboratories inserted (approx): %s", created)
 
     @catch_db_error
     def task_generate_researchers(self, args):
         n = int(args)
-        print(f"[TASK2] Generating {n} researchers...")
+        log.info("Generating %s researchers...", n)
         created = self.model.generate_researchers(n)
-        print(f"[TASK2] Researchers inserted (approx): {created}")
+        log.info("Researchers inserted (approx): %s", created)
 
     @catch_db_error
     def task_generate_objects(self, args):
         n = int(args)
-        print(f"[TASK2] Generating {n} objects...")
+        log.info("Generating %s objects...", n)
         created = self.model.generate_objects(n)
-        print(f"[TASK2] Objects inserted (approx): {created}")
+        log.info("Objects inserted (approx): %s", created)
 
     @catch_db_error
     def task_generate_object_types(self, args):
         n = int(args)
-        print(f"[TASK2] Generating {n} objects...")
+        log.info("Generating %s objects...", n)
         created = self.model.generate_object_types(n)
-        print(f"[TASK2] Objects inserted (approx): {created}")
+        log.info("Objects inserted (approx): %s", created)
 
     @catch_db_error
     def task3_search_researchers(self, args):
@@ -259,8 +294,25 @@ class Controller:
         table, ms = self.model.search_labs(*args)
 
         if not table:
-            print("[INFO] No labs match your filters.")
+            log.info("No labs match your filters.")
         else:
             self.view.output_table(table, "laboratories")
 
-        print(f"[TIME] Query executed in {ms:.3f} ms")
\ No newline at end of file
+        print(f"[TIME] Query executed in {ms:.3f} ms")
+
+    @catch_db_error
+    def task3_search_distance_range(self, args):
+        table, ms = self.model.search_objects_by_distance(*args)
+
+        if not table:
+            log.info("No objects in this distance range.")
+        else:
+            self.view.output_table(table, "objects")
+
+        print(f"[TIME] Query executed in {ms:.2f} ms")
+
+    @catch_db_error
+    def task3_search_nearest(self, args):
+        table, ms = self.model.search_nearest_objects(*args)
+        self.view.output_table(table, "objects")
+        print(f"[TIME] Query executed in {ms:.2f} ms")
\ No newline at end of file
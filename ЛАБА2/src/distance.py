@@ -0,0 +1,95 @@
+# object.distance is stored as double precision, in light years.
+# The catalogue writes distances as text ("~8.6 св.р.", "~10 000 св.р.",
+# "~10.4 млрд св.р.", "1.3 пк"); parse_distance() turns them into numbers.
+import re
+
+LIGHT_YEARS_PER_PARSEC = 3.261563777
+
+# unit suffix (without spaces) -> light years
+UNITS = {
+    "св.р.": 1.0,
+    "пк": LIGHT_YEARS_PER_PARSEC,
+}
+
+# magnitude word (without the trailing dot) -> factor
+MAGNITUDES = {
+    "тис": 1e3,
+    "млн": 1e6,
+    "млрд": 1e9,
+}
+
+# "~10 000", "8,6", "10.4" ; optional magnitude ; optional unit (a bare number is light years)
+DISTANCE_PATTERN = re.compile(
+    r"^\s*[~≈]?\s*(?P<number>\d[\d\s]*(?:[.,]\d+)?)\s*"
+    r"(?:(?P<magnitude>тис|млн|млрд)\.?)?\s*"
+    r"(?P<unit>св\.\s*р\.|пк)?\s*$",
+    re.IGNORECASE,
+)
+
+# column types that are cast to double precision in place
+NUMERIC_TYPES = ("integer", "bigint", "smallint", "numeric", "real")
+
+# text -> light years for the spellings parsed so far; a catalogue column
+# repeats a handful of spellings, so whole columns cost about one dict lookup per value
+PARSE_CACHE_SIZE = 100_000
+_parsed = {}
+
+
+def parse_distance(value) -> float:
+    """
+    Distance in light years from a number or a catalogue string.
+    Raises ValueError for anything else.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    distance = _parsed.get(value)
+    if distance is not None:
+        return distance
+
+    match = DISTANCE_PATTERN.match(value)
+    if not match:
+        raise ValueError(f"Unrecognised distance: {value!r}")
+    distance = float(re.sub(r"\s", "", match["number"]).replace(",", "."))
+    if match["magnitude"]:
+        distance *= MAGNITUDES[match["magnitude"].lower()]
+    if match["unit"]:
+        distance *= UNITS[re.sub(r"\s", "", match["unit"].lower())]
+
+    if len(_parsed) < PARSE_CACHE_SIZE:
+        _parsed[value] = distance
+    return distance
+
+
+def parse_distances(values) -> list:
+    # a whole CSV column at once
+    return [parse_distance(value) for value in values]
+
+
+def migrate_distance_column(cur) -> bool:
+    """
+    Makes object.distance double precision (light years) if it is not yet:
+    numbers are cast in place; text (the varchar(50) of the pgAdmin script)
+    is parsed here, one UPDATE per distinct spelling.
+    Returns True if the column was changed; the caller commits.
+    """
+    cur.execute(
+        "SELECT data_type FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = 'object' AND column_name = 'distance'"
+    )
+    row = cur.fetchone()
+    if row is None or row[0] == "double precision":
+        return False
+
+    if row[0] in NUMERIC_TYPES:
+        cur.execute("ALTER TABLE object ALTER COLUMN distance TYPE double precision USING distance::double precision")
+        return True
+
+    cur.execute("SELECT DISTINCT distance FROM object")
+    spellings = [spelling for (spelling,) in cur.fetchall()]
+    cur.execute("ALTER TABLE object ADD COLUMN distance_ly double precision")
+    for spelling in spellings:
+        cur.execute("UPDATE object SET distance_ly = %s WHERE distance = %s", (parse_distance(spelling), spelling))
+    cur.execute("ALTER TABLE object DROP COLUMN distance")
+    cur.execute("ALTER TABLE object RENAME COLUMN distance_ly TO distance")
+    cur.execute("ALTER TABLE object ALTER COLUMN distance SET NOT NULL")
+    return True
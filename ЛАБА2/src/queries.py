@@ -0,0 +1,371 @@
+# SQL shared by Model (psycopg2) and AsyncModel (asyncpg): plain strings with
+# %s placeholders and the task-3 search builders, no connection needed.
+# ЛАБА2/src/queries.py is a copy: its raw-SQL searches use the same builders
+from .distance import parse_distance
+
+# generated laboratory names: three letters, '-', one of L/O/I/R
+LAB_NAME_PATTERN = "^[A-Z]{3}-[LOIR]$"
+LAB_NAME_SPACE = 26 ** 3 * 4
+# unique over the generated names only: the catalogue has laboratories sharing a name
+LAB_NAME_INDEX = "laboratory_generated_name_key"
+
+# one random generated laboratory name (matches LAB_NAME_PATTERN)
+LAB_NAME_SQL = """
+    chr(65 + trunc(random()*26)::int) ||
+    chr(65 + trunc(random()*26)::int) ||
+    chr(65 + trunc(random()*26)::int) ||
+    '-' ||
+    (ARRAY['L','O','I','R'])[floor(random()*4)::int + 1]
+"""
+
+# (first_id, last_id): a fresh name for every unused id of the range; names
+# drawn twice or already taken are skipped again, so the caller repeats it
+LAB_FILL_QUERY = f"""
+WITH free AS (
+    SELECT r.id, row_number() OVER (ORDER BY r.id) AS k
+    FROM generate_series(%s::bigint, %s::bigint) AS r(id)
+    WHERE NOT EXISTS (SELECT 1 FROM laboratory l WHERE l.id = r.id)
+),
+drawn AS (
+    SELECT DISTINCT ON (lab_name) lab_name, g
+    FROM (
+        SELECT {LAB_NAME_SQL} AS lab_name, g
+        FROM generate_series(1, (SELECT count(*) FROM free)) AS g
+    ) AS gen
+    ORDER BY lab_name, g
+),
+named AS (
+    SELECT lab_name, row_number() OVER (ORDER BY g) AS k FROM drawn
+)
+INSERT INTO laboratory(id, lab_name)
+SELECT free.id, named.lab_name
+FROM free
+JOIN named USING (k)
+ON CONFLICT DO NOTHING
+"""
+
+# search_nearest_objects: objects returned when k is not given
+DEFAULT_NEAREST_K = 50
+
+
+# ======== INSERT QUERIES ========
+INSERT_QUERIES = {
+    "laboratory": """INSERT INTO laboratory(lab_name) VALUES (%s)""",
+    "researcher": """INSERT INTO researcher(full_name, level, laboratory_id) VALUES (%s, %s, %s)""",
+    "object_type": """INSERT INTO object_type(type, galaxy_location) VALUES (%s, %s)""",
+    "object": """INSERT INTO object(name, distance, laboratory_id, type_id) VALUES (%s, %s, %s, %s)""",
+}
+
+# multi-row variants for execute_values (VALUES %s is expanded page by page)
+INSERT_MANY_QUERIES = {
+    "laboratory": """INSERT INTO laboratory(lab_name) VALUES %s RETURNING id""",
+    "researcher": """INSERT INTO researcher(full_name, level, laboratory_id) VALUES %s RETURNING id""",
+    "object_type": """INSERT INTO object_type(type, galaxy_location) VALUES %s RETURNING id""",
+    "object": """INSERT INTO object(name, distance, laboratory_id, type_id) VALUES %s RETURNING id""",
+}
+
+# ======== READ QUERIES ========
+READ_QUERIES = {
+    "laboratory": "SELECT id, lab_name FROM laboratory",
+    "researcher": "SELECT r.id, r.full_name, r.level, l.lab_name "
+                  "FROM researcher AS r "
+                  "JOIN laboratory AS l ON r.laboratory_id = l.id",
+    "object": "SELECT o.id, o.name, o.distance, l.lab_name, t.type, t.galaxy_location "
+              "FROM object AS o "
+              "JOIN laboratory AS l ON o.laboratory_id = l.id "
+              "JOIN object_type AS t ON o.type_id = t.id",
+    "object_type": "SELECT id, type, galaxy_location FROM object_type",
+}
+
+# primary key column of each read query (used for keyset pagination)
+READ_KEYS = {
+    "laboratory": "id",
+    "researcher": "r.id",
+    "object": "o.id",
+    "object_type": "id",
+}
+
+# ======== DELETE QUERIES ========
+DELETE_QUERIES = {
+    "laboratory": "DELETE FROM laboratory WHERE id = %s",
+    "researcher": "DELETE FROM researcher WHERE id = %s",
+    "object": "DELETE FROM object WHERE id = %s",
+    "object_type": "DELETE FROM object_type WHERE id = %s",
+}
+
+# ======== UPDATE QUERIES ========
+UPDATE_QUERIES = {
+    "laboratory": {
+        "lab_name": "UPDATE laboratory SET lab_name = %s WHERE id = %s",
+    },
+    "researcher": {
+        "full_name": "UPDATE researcher SET full_name = %s WHERE id = %s",
+        "level": "UPDATE researcher SET level = %s WHERE id = %s",
+        "laboratory_id": "UPDATE researcher SET laboratory_id = %s WHERE id = %s",
+    },
+    "object_type": {
+        "type": "UPDATE object_type SET type = %s WHERE id = %s",
+        "galaxy_location": "UPDATE object_type SET galaxy_location = %s WHERE id = %s",
+    },
+    "object": {
+        "name": "UPDATE object SET name = %s WHERE id = %s",
+        "distance": "UPDATE object SET distance = %s WHERE id = %s",
+        "laboratory_id": "UPDATE object SET laboratory_id = %s WHERE id = %s",
+        "type_id": "UPDATE object SET type_id = %s WHERE id = %s",
+    },
+}
+
+# ======== GENERATION QUERIES ========
+# every query takes (*fk id arrays, first_id, n) and inserts n random rows
+# with ids first_id .. first_id + n - 1 (laboratory: up to n, names drawn twice
+# or already present are skipped)
+GENERATE_QUERIES = {
+    "laboratory": f"""
+    WITH gen AS (
+        SELECT
+            {LAB_NAME_SQL} AS lab_name,
+            %s::bigint + g - 1 AS id
+        FROM generate_series(1, %s) AS g
+    )
+    INSERT INTO laboratory(id, lab_name)
+    SELECT DISTINCT ON (lab_name) id, lab_name
+    FROM gen
+    ORDER BY lab_name, id
+    ON CONFLICT DO NOTHING;
+    """,
+    "researcher": """
+    WITH params AS (
+        SELECT %s::int[] AS lab_ids, %s::bigint AS first_id, %s::int AS n
+    ),
+    gen AS (
+        SELECT
+            -- Random full name: 5 uppercase letters
+            chr(65 + floor(random()*26)::int) ||
+            chr(65 + floor(random()*26)::int) ||
+            chr(65 + floor(random()*26)::int) ||
+            chr(65 + floor(random()*26)::int) ||
+            chr(65 + floor(random()*26)::int) AS full_name,
+
+            -- Random research level
+            (ARRAY['Junior','Middle','Senior','Lead'])[floor(random()*4)::int + 1] AS level,
+
+            -- Random lab id chosen from provided lab_ids array
+            params.lab_ids[floor(random() * array_length(params.lab_ids, 1))::int + 1] AS lab_id,
+
+            params.first_id + g - 1 AS id
+
+        FROM params, generate_series(1, params.n) AS g
+    )
+    INSERT INTO researcher(id, full_name, level, laboratory_id)
+    SELECT id, full_name, level, lab_id
+    FROM gen;
+    """,
+    "object": """
+    WITH params AS (
+        SELECT %s::int[] AS lab_ids,
+               %s::int[] AS type_ids,
+               %s::bigint AS first_id,
+               %s::int    AS n
+    ),
+    gen AS (
+        SELECT
+            -- random object name
+            chr(65 + floor(random()*26)::int) ||
+            chr(65 + floor(random()*26)::int) ||
+            chr(65 + floor(random()*26)::int) ||
+            chr(65 + floor(random()*26)::int) ||
+            chr(65 + floor(random()*26)::int) AS name,
+
+            -- random distance between 1,000 and 1,000,000,000 light years
+            (random() * 999999000 + 1000)::int AS distance,
+
+            -- random lab
+            params.lab_ids[
+                floor(random() * array_length(params.lab_ids, 1))::int + 1
+            ] AS lab_id,
+
+            -- random type
+            params.type_ids[
+                floor(random() * array_length(params.type_ids, 1))::int + 1
+            ] AS type_id,
+
+            params.first_id + g - 1 AS id
+
+        FROM params, generate_series(1, params.n) AS g
+    )
+    INSERT INTO object(id, name, distance, laboratory_id, type_id)
+    SELECT id, name, distance, lab_id, type_id
+    FROM gen;
+    """,
+    "object_type": """
+    WITH gen AS (
+        SELECT
+            -- random type name (5 LETTERS)
+            chr(65 + floor(random()*26)::int) ||
+            chr(65 + floor(random()*26)::int) ||
+            chr(65 + floor(random()*26)::int) ||
+            chr(65 + floor(random()*26)::int) ||
+            chr(65 + floor(random()*26)::int)     AS type,
+
+            -- random location (5 LETTERS)
+            chr(65 + floor(random()*26)::int) ||
+            chr(65 + floor(random()*26)::int) ||
+            chr(65 + floor(random()*26)::int) ||
+            chr(65 + floor(random()*26)::int) ||
+            chr(65 + floor(random()*26)::int)     AS galaxy_location,
+
+            %s::bigint + g - 1 AS id
+        FROM generate_series(1, %s) AS g
+    )
+    INSERT INTO object_type(id, type, galaxy_location)
+    SELECT id, type, galaxy_location FROM gen;
+    """,
+}
+
+
+# ======== TASK 3: SEARCH ========
+# each search_*_sql builder returns (sql, args) without ORDER BY,
+# so the same filter can be run in full, streamed or paged.
+# Only active filters become SQL: a bare "col LIKE '%x%'" can use the
+# trigram index, "('x' = '-' OR col LIKE ...)" in a generic plan cannot.
+
+
+def _is_wildcard(value):
+    return value in ("", "-")
+
+
+def _where(clauses):
+    return "WHERE " + (" AND ".join(clauses) if clauses else "TRUE")
+
+
+def search_researchers_sql(lab_like, level):
+    clauses, args = [], []
+    if lab_like != "-":
+        clauses.append("l.lab_name LIKE %s")
+        args.append(f"%{lab_like}%")
+    if level != "-":
+        clauses.append("r.level = %s")
+        args.append(level)
+
+    sql = f"""
+    SELECT r.id, r.full_name, r.level, l.lab_name
+    FROM researcher r
+    JOIN laboratory l ON r.laboratory_id = l.id
+    {_where(clauses)}
+    """
+    return sql, args
+
+
+def search_objects_sql(lab_like, type_like):
+    clauses, args = [], []
+    if not _is_wildcard(lab_like):
+        clauses.append("l.lab_name LIKE %s")
+        args.append(f"%{lab_like}%")
+    if not _is_wildcard(type_like):
+        clauses.append("t.type LIKE %s")
+        args.append(f"%{type_like}%")
+
+    sql = f"""
+        SELECT o.id, o.name, o.distance, l.lab_name, t.type, t.galaxy_location
+        FROM object o
+        JOIN laboratory l ON o.laboratory_id = l.id
+        JOIN object_type t ON o.type_id = t.id
+        {_where(clauses)}
+    """
+    return sql, args
+
+
+def search_distance_range_sql(min_distance, max_distance):
+    # one range scan of object_distance_idx, already in distance order
+    min_distance, max_distance = parse_distance(min_distance), parse_distance(max_distance)
+    if min_distance > max_distance:
+        raise ValueError(f"Empty distance range: {min_distance} > {max_distance}")
+    sql = """
+        SELECT o.id, o.name, o.distance, l.lab_name, t.type, t.galaxy_location
+        FROM object o
+        JOIN laboratory l ON o.laboratory_id = l.id
+        JOIN object_type t ON o.type_id = t.id
+        WHERE o.distance BETWEEN %s AND %s
+    """
+    return sql, [min_distance, max_distance]
+
+
+def search_nearest_sql(distance, k=DEFAULT_NEAREST_K):
+    # the k nearest are among the k first rows above the target and the k
+    # first below it: two index scans that stop after k rows each, instead
+    # of ORDER BY abs(distance - target) over the whole table
+    distance, k = parse_distance(distance), int(k)
+    if k < 1:
+        raise ValueError(f"k must be positive, got {k}")
+    sql = """
+        SELECT nearest.id, nearest.name, nearest.distance, nearest.lab_name, nearest.type, nearest.galaxy_location
+        FROM (
+            SELECT o.id, o.name, o.distance, l.lab_name, t.type, t.galaxy_location,
+                   abs(o.distance - %s) AS gap
+            FROM (
+                (SELECT id FROM object WHERE distance >= %s ORDER BY distance LIMIT %s)
+                UNION ALL
+                (SELECT id FROM object WHERE distance < %s ORDER BY distance DESC LIMIT %s)
+            ) candidates
+            JOIN object o ON o.id = candidates.id
+            JOIN laboratory l ON o.laboratory_id = l.id
+            JOIN object_type t ON o.type_id = t.id
+            ORDER BY gap, o.id
+            LIMIT %s
+        ) nearest
+    """
+    return sql, [distance, distance, k, distance, k, k]
+
+
+def search_labs_sql(rname_like, level, obj_like):
+    # semi-joins instead of DISTINCT over LEFT JOIN researcher + LEFT JOIN object:
+    # the joins built researchers x objects rows per lab before deduplicating,
+    # EXISTS stops at the first matching row and each table is probed once per lab.
+    # Name and level must hold for the same researcher, as before.
+    researcher_clauses, object_clauses, args = [], [], []
+    if not _is_wildcard(rname_like):
+        researcher_clauses.append("r.full_name LIKE %s")
+        args.append(f"%{rname_like}%")
+    if not _is_wildcard(level):
+        researcher_clauses.append("r.level = %s")
+        args.append(level)
+    if not _is_wildcard(obj_like):
+        object_clauses.append("o.name LIKE %s")
+        args.append(f"%{obj_like}%")
+
+    clauses = []
+    if researcher_clauses:
+        clauses.append(f"""EXISTS (
+            SELECT 1 FROM researcher r
+            WHERE r.laboratory_id = l.id AND {" AND ".join(researcher_clauses)}
+        )""")
+    if object_clauses:
+        clauses.append(f"""EXISTS (
+            SELECT 1 FROM object o
+            WHERE o.laboratory_id = l.id AND {" AND ".join(object_clauses)}
+        )""")
+
+    sql = f"""
+    SELECT l.id, l.lab_name
+    FROM laboratory l
+    {_where(clauses)}
+    """
+    return sql, args
+
+
+# name -> (builder returning (sql, args), key column for ORDER BY)
+# (the distance searches order by distance, so they have no *_page variant)
+SEARCH_BUILDERS = {
+    "researchers": (search_researchers_sql, "r.id"),
+    "objects": (search_objects_sql, "o.id"),
+    "labs": (search_labs_sql, "l.id"),
+    "distance_range": (search_distance_range_sql, "o.distance, o.id"),
+    "nearest": (search_nearest_sql, "nearest.gap, nearest.id"),
+}
+
+
+def search_query(search_name, *args):
+    # (full search SQL with ORDER BY, its parameters)
+    builder, key = SEARCH_BUILDERS[search_name]
+    sql, params = builder(*args)
+    return f"{sql} ORDER BY {key}", params
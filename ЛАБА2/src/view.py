@@ -1,5 +1,9 @@
 from typing import Callable, Union
 from tabulate import tabulate
+from .queries import DEFAULT_NEAREST_K
+
+# distances are doubles in light years: plain digits up to 12 significant ones, not 1e+09
+DISTANCE_FORMAT = ".12g"
 
 
 class View:
@@ -12,6 +16,7 @@ class View:
             "delete": self.show_menu_delete,
             "task_2": self.show_task2_menu,
             "task_3": self.show_task3_menu,
+            "transaction": self.show_transaction_menu,
             "quit": None,
         }
 
@@ -54,12 +59,20 @@ class View:
             "search_researchers": self.show_task3_search_researchers,
             "search_objects": self.show_task3_search_objects,
             "search_labs": self.show_task3_search_labs,
+            "search_distance_range": self.show_task3_search_distance_range,
+            "search_nearest": self.show_task3_search_nearest,
+        }
+
+        self.available_transaction: dict = {
+            "begin": self.show_transaction_begin,
+            "commit": self.show_transaction_commit,
+            "rollback": self.show_transaction_rollback,
         }
 
         self.table_headers: dict = {
             "laboratories": ("id", "lab_name"),
             "researchers": ("id", "full_name", "level", "laboratory_id"),
-            "objects": ("id", "name", "distance", "laboratory_id", "type", "galaxy_location"),
+            "objects": ("id", "name", "distance (ly)", "laboratory_id", "type", "galaxy_location"),
             "object_types": ("id", "type", "galaxy_location"),
             
         }
@@ -71,7 +84,8 @@ class View:
         print(
             tabulate(
                 [[field.strip() if isinstance(field, str) else field for field in row] for row in table],
-                headers=self.table_headers[table_name]
+                headers=self.table_headers[table_name],
+                floatfmt=DISTANCE_FORMAT,
             )
         )
 
@@ -144,7 +158,7 @@ class View:
     @staticmethod
     def show_create_object():
         name = input("Enter object name: ")
-        distance = input("Enter distance: ")
+        distance = input("Enter distance (light years, or e.g. '8.6 св.р.', '1.3 пк', '10.4 млрд св.р.'): ")
         lab_id = input("Enter laboratory ID: ")
         type_id = input("Enter object_type ID: ")
         return name, distance, lab_id, type_id
@@ -348,4 +362,51 @@ class View:
         rname = input("Enter researcher name (LIKE) or '-' for all: ").strip()
         level = input("Enter researcher level (Junior/Middle/Senior/Lead) or '-' for all: ").strip()
         obj_name = input("Enter object name (LIKE) or '-' for all: ").strip()
-        return rname, level, obj_name
\ No newline at end of file
+        return rname, level, obj_name
+
+    @staticmethod
+    def show_task3_search_distance_range():
+        min_distance = input("Enter minimum distance (light years, or e.g. '1.3 пк'): ").strip()
+        max_distance = input("Enter maximum distance (light years, or e.g. '10 тис. св.р.'): ").strip()
+        return min_distance, max_distance
+
+    @staticmethod
+    def show_task3_search_nearest():
+        distance = input("Enter distance (light years, or e.g. '1.3 пк'): ").strip()
+        k = input(f"Enter number of objects [{DEFAULT_NEAREST_K}]: ").strip()
+        return distance, int(k) if k.isdigit() else DEFAULT_NEAREST_K
+
+    # ----------- TRANSACTION (unit of work) -----------
+
+    def show_transaction_menu(self):
+        self._output_options(
+            self.available_transaction,
+            amount_of_tabs=1,
+            title="Transaction: group the next operations into one commit"
+        )
+        response = self._handle_wrong_input(self.available_transaction)
+        return response, self._get_key_by_value(self.available_transaction, response)
+
+    @staticmethod
+    def show_transaction_begin():
+        return None
+
+    @staticmethod
+    def show_transaction_commit():
+        return None
+
+    @staticmethod
+    def show_transaction_rollback():
+        return None
+
+    @staticmethod
+    def output_transaction_state(state, writes=0):
+        messages = {
+            "begin": "[TRANSACTION] Started: changes are committed only on 'commit'",
+            "commit": f"[TRANSACTION] Committed {writes} writes",
+            "failed": f"[TRANSACTION] A statement failed: all {writes} writes were rolled back",
+            "rollback": f"[TRANSACTION] Rolled back {writes} writes",
+            "open": "[TRANSACTION] A transaction is already open",
+            "none": "[TRANSACTION] No open transaction",
+        }
+        print(messages[state])
@@ -1,6 +1,32 @@
+import argparse
+import sys
+
 from src.controller import Controller
+from src.log import configure
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Astronomy data CRUD: interactive menu or batch commands")
+    parser.add_argument("--batch", metavar="FILE",
+                        help='JSON-lines command file ("-" for stdin) to run instead of the menu')
+    parser.add_argument("--group", type=int, default=1, metavar="N",
+                        help="batch mode: commit every N consecutive writes in one transaction")
+    parser.add_argument("--log-level", choices=("DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR"), type=str.upper,
+                        help="WARNING hides per-operation messages, DEBUG adds SQL statements (default: INFO)")
+    parser.add_argument("--sql-sample", type=float, metavar="SHARE",
+                        help="share of SQL statements logged at DEBUG, 0..1 (default: 1)")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
+    arguments = parse_args()
+    configure(arguments.log_level, arguments.sql_sample)
     controller = Controller()
-    controller.run()
+    if arguments.batch:
+        if arguments.batch == "-":
+            controller.run_batch(sys.stdin, arguments.group)
+        else:
+            with open(arguments.batch, encoding="utf-8") as commands:
+                controller.run_batch(commands, arguments.group)
+    else:
+        controller.run()
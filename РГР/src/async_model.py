@@ -0,0 +1,283 @@
+import asyncio
+import re
+import time
+
+import asyncpg
+
+from .distance import parse_distance
+from .log import log
+from .generation import RESERVE_IDS_QUERY, chunk_seed, plan_chunks
+from .model import DB_CONFIG, DEFAULT_GENERATE_CHUNK_SIZE, DEFAULT_PAGE_SIZE
+from .queries import (
+    DEFAULT_NEAREST_K, DELETE_QUERIES, GENERATE_QUERIES, INSERT_QUERIES, LAB_FILL_QUERY, LAB_NAME_INDEX,
+    LAB_NAME_PATTERN, LAB_NAME_SPACE, READ_KEYS, READ_QUERIES, UPDATE_QUERIES, search_query,
+)
+
+
+def to_asyncpg(query: str) -> str:
+    # "%s" placeholders -> "$1, $2, ..."
+    counter = iter(range(1, query.count("%s") + 1))
+    return re.sub(r"%s", lambda _: f"${next(counter)}", query)
+
+
+def _affected(status: str) -> int:
+    # command tag -> row count: "UPDATE 1" -> 1, "INSERT 0 5" -> 5
+    try:
+        return int(status.rsplit(" ", 1)[-1])
+    except ValueError:
+        return 0
+
+
+class AsyncModel:
+    """
+    asyncio counterpart of Model on asyncpg, with its own connection pool.
+
+    - same method names as Model (create_*, read, update_*_field, delete_*,
+      search_*, generate_*); every one of them is a coroutine
+    - the SQL is Model's own (src/queries.py), with %s rewritten to $n;
+      asyncpg prepares and caches every statement per connection
+    - many calls can run at once on one event loop, up to max_connections
+      queries in flight
+    - values are sent with their Python types, so they must match the column
+      types (an int for laboratory_id, not "42"); distance goes through
+      parse_distance() as in Model
+    - no result cache and no resumable generation jobs: generate_* runs its
+      chunks concurrently on the pool and returns when all are committed
+
+        async with AsyncModel() as model:
+            rows, ms = await model.search_researchers("AB", "-")
+    """
+
+    def __init__(self, min_connections=1, max_connections=10, pool_timeout=30.0):
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self.pool_timeout = pool_timeout
+        self.pool = None
+
+        self.insert_queries = INSERT_QUERIES
+        self.read_queries = READ_QUERIES
+        self.read_keys = READ_KEYS
+        self.delete_queries = DELETE_QUERIES
+        self.update_queries = UPDATE_QUERIES
+        self.generate_queries = GENERATE_QUERIES
+
+    async def connect(self):
+        self.pool = await asyncpg.create_pool(
+            database=DB_CONFIG["database"],
+            user=DB_CONFIG["user"],
+            password=DB_CONFIG["password"],
+            host=DB_CONFIG["host"],
+            port=int(DB_CONFIG["port"]),
+            min_size=self.min_connections,
+            max_size=self.max_connections,
+            timeout=self.pool_timeout,
+        )
+        return self
+
+    async def disconnect(self):
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, *exc_info):
+        await self.disconnect()
+
+    # ======== INTERNAL ========
+
+    async def _fetch(self, query: str, data=()) -> list:
+        rows = await self.pool.fetch(to_asyncpg(query), *data)
+        return [tuple(row) for row in rows]
+
+    async def _execute_select(self, query: str, data=()) -> list:
+        try:
+            return await self._fetch(query, data)
+        except Exception as e:
+            log.error("Unexpected error in SELECT: %s %s", type(e).__name__, e)
+            return []
+
+    async def _execute_modify(self, query: str, data: tuple) -> int:
+        try:
+            return _affected(await self.pool.execute(to_asyncpg(query), *data))
+        except Exception as e:
+            log.error("Unexpected error in modify-query: %s %s", type(e).__name__, e)
+            return 0
+
+    async def _execute_search(self, query: str, data) -> tuple[list, float]:
+        t0 = time.time()
+        rows = await self._fetch(query, data)
+        return rows, (time.time() - t0) * 1000
+
+    # ======== CRUD OPERATIONS ========
+
+    ## CREATE
+    async def create_laboratory(self, lab_name):
+        return await self._execute_modify(self.insert_queries["laboratory"], (lab_name,))
+
+    async def create_researcher(self, full_name, level, laboratory_id):
+        return await self._execute_modify(self.insert_queries["researcher"], (full_name, level, laboratory_id))
+
+    async def create_object_type(self, type_name, galaxy_location):
+        return await self._execute_modify(self.insert_queries["object_type"], (type_name, galaxy_location))
+
+    async def create_object(self, name, distance, laboratory_id, type_id):
+        distance = parse_distance(distance)
+        return await self._execute_modify(self.insert_queries["object"], (name, distance, laboratory_id, type_id))
+
+    ## READ
+    async def read(self, table_name):
+        return await self._execute_select(self.read_queries[table_name])
+
+    async def read_page(self, table_name, after_id=None, limit=DEFAULT_PAGE_SIZE):
+        key = self.read_keys[table_name]
+        query = self.read_queries[table_name]
+        if after_id is None:
+            return await self._execute_select(f"{query} ORDER BY {key} LIMIT %s", (limit,))
+        return await self._execute_select(f"{query} WHERE {key} > %s ORDER BY {key} LIMIT %s", (after_id, limit))
+
+    ## UPDATE
+    async def update_laboratory_field(self, lab_id, new_name):
+        return await self._execute_modify(self.update_queries["laboratory"]["lab_name"], (new_name, lab_id))
+
+    async def _update_field(self, table_name, record_id, field, new_value):
+        query = self.update_queries[table_name].get(field)
+        if not query:
+            raise ValueError(f"Unknown field for {table_name}: {field}")
+        return await self._execute_modify(query, (new_value, record_id))
+
+    async def update_researcher_field(self, researcher_id, field, new_value):
+        return await self._update_field("researcher", researcher_id, field, new_value)
+
+    async def update_object_type_field(self, type_id, field, new_value):
+        return await self._update_field("object_type", type_id, field, new_value)
+
+    async def update_object_field(self, object_id, field, new_value):
+        if field == "distance":
+            new_value = parse_distance(new_value)
+        return await self._update_field("object", object_id, field, new_value)
+
+    ## DELETE
+    async def delete(self, table_name, record_id):
+        return await self._execute_modify(self.delete_queries[table_name], (record_id,))
+
+    async def delete_laboratory(self, lab_id):
+        return await self.delete("laboratory", lab_id)
+
+    async def delete_researcher(self, researcher_id):
+        return await self.delete("researcher", researcher_id)
+
+    async def delete_object(self, object_id):
+        return await self.delete("object", object_id)
+
+    async def delete_object_type(self, type_id):
+        return await self.delete("object_type", type_id)
+
+    # ======== SEARCH ========
+
+    async def _search(self, search_name, *args):
+        query, params = search_query(search_name, *args)
+        return await self._execute_search(query, params)
+
+    async def search_researchers(self, lab_like, level):
+        return await self._search("researchers", lab_like, level)
+
+    async def search_objects(self, lab_like, type_like):
+        return await self._search("objects", lab_like, type_like)
+
+    async def search_labs(self, rname_like, level, obj_like):
+        return await self._search("labs", rname_like, level, obj_like)
+
+    async def search_objects_by_distance(self, min_distance, max_distance):
+        return await self._search("distance_range", min_distance, max_distance)
+
+    async def search_nearest_objects(self, distance, k=DEFAULT_NEAREST_K):
+        return await self._search("nearest", distance, k)
+
+    # ======== GENERATION ========
+
+    async def _generate_chunk(self, table_name, fk_params, first_id, rows, seed):
+        query = to_asyncpg(self.generate_queries[table_name])
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                if seed is not None:
+                    await conn.execute("SELECT setseed($1)", chunk_seed(seed, table_name, first_id))
+                return _affected(await conn.execute(query, *fk_params, first_id, rows))
+
+    async def _reserve_ids(self, table_name, n) -> int:
+        # first id of a freshly reserved range of n ids
+        last_id = (await self._fetch(RESERVE_IDS_QUERY, (table_name, table_name, n)))[0][0]
+        return last_id - n + 1
+
+    async def _execute_generate(self, table_name, fk_params, n, chunk_size=DEFAULT_GENERATE_CHUNK_SIZE, seed=None):
+        first_id = await self._reserve_ids(table_name, n)
+        return await self._generate_range(table_name, fk_params, first_id, n, chunk_size, seed)
+
+    async def _generate_range(self, table_name, fk_params, first_id, n, chunk_size, seed):
+        # same id reservation, chunk boundaries and per-chunk seeds as Model,
+        # so a seeded run gives the same rows as the sync model
+        chunks = [
+            self._generate_chunk(table_name, fk_params, first_id + chunk_no * chunk_size, rows, seed)
+            for chunk_no, rows in plan_chunks(n, chunk_size)
+        ]
+        if table_name == "laboratory":
+            # one at a time, as in Model: which chunk keeps a name drawn twice must not depend on timing
+            inserted = 0
+            for chunk in chunks:
+                inserted += await chunk
+        else:
+            inserted = sum(await asyncio.gather(*chunks))
+        await self.pool.execute(f"ANALYZE {table_name}")
+        return inserted
+
+    async def generate_laboratories(self, n: int, chunk_size: int = DEFAULT_GENERATE_CHUNK_SIZE, seed=None,
+                                    exact: bool = False):
+        if (await self._fetch("SELECT to_regclass(%s)", (LAB_NAME_INDEX,)))[0][0] is None:
+            raise RuntimeError(f"Index {LAB_NAME_INDEX} is missing, so generated laboratory names would not be unique.")
+        if not exact:
+            return await self._execute_generate("laboratory", (), n, chunk_size, seed)
+
+        # as in Model: one id range, whose unused ids get fresh names until n exist
+        taken = (await self._fetch(
+            "SELECT count(*) FROM laboratory WHERE lab_name ~ %s", (LAB_NAME_PATTERN,)
+        ))[0][0]
+        if LAB_NAME_SPACE - taken < n:
+            raise ValueError(f"Only {LAB_NAME_SPACE - taken} unused generated laboratory names left, {n} requested")
+
+        first_id = await self._reserve_ids("laboratory", n)
+        inserted = await self._generate_range("laboratory", (), first_id, n, chunk_size, seed)
+        fill_pass = 0
+        while inserted < n:
+            fill_pass += 1
+            async with self.pool.acquire() as conn:
+                async with conn.transaction():
+                    if seed is not None:
+                        fill_seed = chunk_seed(seed, "laboratory:fill", first_id + fill_pass)
+                        await conn.execute("SELECT setseed($1)", fill_seed)
+                    status = await conn.execute(to_asyncpg(LAB_FILL_QUERY), first_id, first_id + n - 1)
+                    inserted += _affected(status)
+        return inserted
+
+    async def _ids(self, table_name) -> list:
+        return [row[0] for row in await self._fetch(f"SELECT id FROM {table_name} ORDER BY id")]
+
+    async def generate_researchers(self, n: int, chunk_size: int = DEFAULT_GENERATE_CHUNK_SIZE, seed=None):
+        lab_ids = await self._ids("laboratory")
+        if not lab_ids:
+            log.error("Cannot generate researchers: no laboratories exist.")
+            return 0
+        return await self._execute_generate("researcher", (lab_ids,), n, chunk_size, seed)
+
+    async def generate_objects(self, n: int, chunk_size: int = DEFAULT_GENERATE_CHUNK_SIZE, seed=None):
+        lab_ids, type_ids = await asyncio.gather(self._ids("laboratory"), self._ids("object_type"))
+        if not lab_ids:
+            log.error("Cannot generate objects: no laboratories exist.")
+            return 0
+        if not type_ids:
+            log.error("Cannot generate objects: no object types exist.")
+            return 0
+        return await self._execute_generate("object", (lab_ids, type_ids), n, chunk_size, seed)
+
+    async def generate_object_types(self, n: int, chunk_size: int = DEFAULT_GENERATE_CHUNK_SIZE, seed=None):
+        return await self._execute_generate("object_type", (), n, chunk_size, seed)
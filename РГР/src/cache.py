@@ -0,0 +1,122 @@
+from collections import OrderedDict, Counter
+import sys
+import threading
+import time
+
+
+def estimate_size(rows) -> int:
+    # rough in-memory size of a list of row tuples, in bytes
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row)
+        for field in row:
+            size += sys.getsizeof(field)
+    return size
+
+
+class QueryCache:
+    """
+    In-process cache of query results.
+
+    - key: (query, params); value: the rows, stored as a tuple; every hit
+      gets its own list, so a caller changing its result cannot change the entry
+    - LRU eviction once the estimated size of all entries exceeds max_bytes
+    - entries older than ttl seconds are treated as missing
+    - every entry remembers the tables it was read from, so a write to a table
+      drops exactly the entries that depend on it
+    - a result read while one of its tables was being written (version changed
+      between version() and put()) is not stored
+    - only Model.read() and search_*() use it; the streaming reads
+      (read_stream / search_stream, the controller's default for menu reads)
+      never do, so in the menus it serves the task-3 searches
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, ttl=60.0):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self._entries = OrderedDict()     # key -> (rows, tables, size, stored_at)
+        self._bytes = 0
+        self._versions = Counter()        # table -> number of invalidations
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _drop(self, key):
+        _, _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key):
+        # returns (hit, rows)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[3] > self.ttl:
+                self._drop(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, list(entry[0])
+
+    def version(self, tables) -> tuple:
+        with self._lock:
+            return tuple(self._versions[table] for table in sorted(tables))
+
+    def put(self, key, rows, tables, version):
+        if not self.enabled:
+            return
+        size = estimate_size(rows)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if version != tuple(self._versions[table] for table in sorted(tables)):
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (tuple(rows), frozenset(tables), size, time.monotonic())
+            self._bytes += size
+
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate(self, tables):
+        tables = set(tables)
+        with self._lock:
+            for table in tables:
+                self._versions[table] += 1
+            stale = [key for key, entry in self._entries.items() if entry[1] & tables]
+            for key in stale:
+                self._drop(key)
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
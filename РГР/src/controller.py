@@ -1,25 +1,72 @@
-﻿from .model import Model
+﻿from .model import Model, DEFAULT_ITERSIZE, DEFAULT_PAGE_SIZE
 from .view import View
+from .log import SUCCESS, log
 from functools import wraps
+from collections import Counter
+import json
+import time
 from psycopg2.errors import StringDataRightTruncation
 
 
 def catch_db_error(option):
+    # returns False when the option failed (used to count failures in batch mode)
     @wraps(option)
     def inner(self, *args, **kwargs):
         try:
-            option(self, *args, **kwargs)
+            return option(self, *args, **kwargs)
         except (IndexError, StringDataRightTruncation, ValueError, AssertionError) as e:
-            print(f"\n Known DB error: {type(e).__name__} — {e}\n")
+            log.error("Known DB error: %s — %s", type(e).__name__, e)
             self.view.output_error_message()
         except Exception as e:
-            print(f"\n Unexpected error in {option.__name__}: {type(e).__name__} — {e}\n")
+            log.error("Unexpected error in %s: %s — %s", option.__name__, type(e).__name__, e)
             self.view.output_error_message()
+        return False
     return inner
 
 
+# batch mode: columns a "create" command must carry, in the order create_* takes them
+BATCH_CREATE_COLUMNS = {
+    "laboratory": ("lab_name",),
+    "researcher": ("full_name", "level", "laboratory_id"),
+    "object": ("name", "distance", "laboratory_id", "type_id"),
+    "object_type": ("type", "galaxy_location"),
+}
+
+BATCH_GENERATE_OPTIONS = {
+    "laboratory": "generate_labs",
+    "researcher": "generate_researchers",
+    "object": "generate_objects",
+    "object_type": "generate_object_types",
+}
+
+BATCH_WRITE_OPS = ("create", "update", "delete")
+
+
 class Controller:
-    def __init__(self):
+    def __init__(self, stream_itersize=DEFAULT_ITERSIZE, page_size=DEFAULT_PAGE_SIZE):
+        # reads go through a server-side cursor in batches of stream_itersize rows;
+        # None switches back to fetching the whole table at once
+        self.stream_itersize = stream_itersize
+
+        self.table_names = {
+            "laboratories": "laboratory",
+            "researchers": "researcher",
+            "objects": "object",
+            "object_types": "object_type",
+        }
+
+        # browse mode: table -> stack of "after_id" cursors, one per visited page.
+        # Kept between calls, so browsing a table again resumes on the same page.
+        self.page_size = page_size
+        self.page_cursors = {}
+
+        # task 3: also rerun every search under EXPLAIN ANALYZE and print the plan
+        self.explain_searches = False
+
+        # batch mode: no prompts; an unfinished generation job is resumed only
+        # when the generate command says "resume": true
+        self.interactive = True
+        self.batch_resume = False
         self.available = {
             "create": {
                 "laboratory": self.create_laboratory,
@@ -33,6 +80,12 @@ class Controller:
                 "objects": self.read,
                 "object_types": self.read,
             },
+            "browse": {
+                "laboratories": self.browse,
+                "researchers": self.browse,
+                "objects": self.browse,
+                "object_types": self.browse,
+            },
             "update": {
                 "laboratory": self.update_laboratory,
                 "researcher": self.update_researcher,
@@ -50,11 +103,38 @@ class Controller:
                 "generate_researchers": self.task_generate_researchers,
                 "generate_objects": self.task_generate_objects,
                 "generate_object_types": self.task_generate_object_types,
+                "fingerprint": self.task_fingerprint,
             },
             "task_3": {
                 "search_researchers": self.task3_search_researchers,
                 "search_objects": self.task3_search_objects,
                 "search_labs": self.task3_search_labs,
+                "search_distance_range": self.task3_search_distance_range,
+                "search_nearest": self.task3_search_nearest,
+                "toggle_explain": self.task3_toggle_explain,
+            },
+            "import": {
+                "catalogue": self.import_catalogue,
+                "laboratory": self.import_table,
+                "researcher": self.import_table,
+                "object": self.import_table,
+                "object_type": self.import_table,
+            },
+            "export": {
+                "laboratories": self.export_table,
+                "researchers": self.export_table,
+                "objects": self.export_table,
+                "object_types": self.export_table,
+                "search_researchers": self.export_search,
+                "search_objects": self.export_search,
+                "search_labs": self.export_search,
+                "search_distance_range": self.export_search,
+                "search_nearest": self.export_search,
+            },
+            "transaction": {
+                "begin": self.transaction_begin,
+                "commit": self.transaction_commit,
+                "rollback": self.transaction_rollback,
             },
         }
         self.model = Model()
@@ -64,6 +144,8 @@ class Controller:
         while True:
             chosen_mode_viewer, chosen_mode = self.view.show_menu()
             if not chosen_mode_viewer:
+                if self.model.in_transaction():
+                    self.transaction_rollback(None)
                 self.model.disconnect()
                 break
             chosen_option_viewer, chosen_option = chosen_mode_viewer()
@@ -72,6 +154,153 @@ class Controller:
 
             self.available[chosen_mode][chosen_option](args_or_command)
 
+    # --- TRANSACTION (unit of work over several menu operations) ---
+    def transaction_begin(self, _):
+        if self.model.in_transaction():
+            self.view.output_transaction_state("open")
+            return
+        self.model.begin()
+        self.view.output_transaction_state("begin")
+
+    def transaction_commit(self, _):
+        if not self.model.in_transaction():
+            self.view.output_transaction_state("none")
+            return False
+        tx = self.model.current_transaction()
+        committed = self.model.commit()
+        self.view.output_transaction_state("commit" if committed else "failed", tx.writes)
+        return committed
+
+    def transaction_rollback(self, _):
+        if not self.model.in_transaction():
+            self.view.output_transaction_state("none")
+            return
+        tx = self.model.current_transaction()
+        self.model.rollback()
+        self.view.output_transaction_state("rollback", tx.writes)
+
+    # --- BATCH MODE ---
+    def _batch_command(self, command: dict) -> tuple:
+        # one JSON command -> (mode, option, args) in the form the menu viewers return them
+        op = command["op"]
+        plural = {table_name: name for name, table_name in self.table_names.items()}
+
+        if op == "create":
+            table_name = command["table"]
+            args = tuple(command[column] for column in BATCH_CREATE_COLUMNS[table_name])
+            return "create", table_name, args
+        if op == "update":
+            table_name = command["table"]
+            if table_name == "laboratory":
+                return "update", table_name, (command["id"], command["value"])
+            return "update", table_name, (command["id"], command["field"], command["value"])
+        if op == "delete":
+            return "delete", command["table"], command["id"]
+        if op == "read":
+            name = plural.get(command["table"], command["table"])
+            return "read", name, name
+        if op == "search":
+            return "task_3", f"search_{command['name']}", tuple(command["args"])
+        if op == "generate":
+            table_name = command["table"]
+            n, seed = command["n"], command.get("seed")
+            self.batch_resume = bool(command.get("resume", False))
+            if table_name == "laboratory":
+                args = (n, seed, bool(command.get("exact", False)))
+            else:
+                args = (n, command.get("workers", 1), seed, command.get("engine", "sql"))
+            return "task_2", BATCH_GENERATE_OPTIONS[table_name], args
+        if op == "fingerprint":
+            return "task_2", "fingerprint", None
+        if op in ("begin", "commit", "rollback"):
+            return "transaction", op, None
+        if op == "import":
+            table_name = command["table"]
+            if table_name == "catalogue":
+                return "import", "catalogue", command["path"]
+            return "import", table_name, (table_name, command["path"])
+        if op == "export":
+            fmt = command.get("format", "csv")
+            if "search" in command:
+                search_name = command["search"]
+                return "export", f"search_{search_name}", (search_name, tuple(command["args"]), command["path"], fmt)
+            name = plural.get(command["table"], command["table"])
+            return "export", name, (name, command["path"], fmt)
+        raise ValueError(f"Unknown op: {op}")
+
+    def run_batch(self, lines, group_size=1):
+        """
+        Runs JSON-line commands, one per line, e.g.
+            {"op": "update", "table": "object", "id": 5, "field": "distance", "value": 42}
+        through self.available, on this controller's one model. Empty lines
+        and lines starting with # are skipped.
+        Up to group_size consecutive writes (create / update / delete) share
+        one transaction; a failed write rolls back its whole group.
+        {"op": "begin"} .. {"op": "commit"} makes everything in between one
+        unit of work; a transaction still open at the end is rolled back.
+        Ends with a throughput summary.
+        """
+        self.interactive = False
+        stats = Counter()
+        group = []
+        t0 = time.time()
+
+        def flush():
+            if not group:
+                return
+            # inside an explicit begin .. commit the group joins that transaction
+            joined = self.model.in_transaction()
+            with self.model.transaction() as tx:
+                for mode, option, args in group:
+                    if self.available[mode][option](args) is False:
+                        tx.failed = True
+            if not joined:
+                stats["transactions"] += 1
+            if tx.committed or (joined and not tx.failed):
+                stats["ok"] += len(group)
+            else:
+                stats["failed"] += len(group)
+                stats["rolled_back"] += len(group)
+            group.clear()
+
+        for line_no, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            stats["commands"] += 1
+            try:
+                command = json.loads(line)
+                mode, option, args = self._batch_command(command)
+                self.available[mode][option]
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"[BATCH] Line {line_no}: invalid command ({type(e).__name__}: {e})")
+                stats["failed"] += 1
+                continue
+
+            if command["op"] in BATCH_WRITE_OPS:
+                # every write runs in a transaction, so a failed one is seen and counted
+                stats["writes"] += 1
+                group.append((mode, option, args))
+                if len(group) >= group_size:
+                    flush()
+                continue
+
+            # reads and bulk operations must see the writes before them
+            flush()
+
+            if self.available[mode][option](args) is False:
+                stats["failed"] += 1
+            else:
+                stats["ok"] += 1
+
+        flush()
+        if self.model.in_transaction():
+            self.transaction_rollback(None)
+        stats["seconds"] = time.time() - t0
+        self.view.output_batch_summary(stats)
+        self.model.disconnect()
+        return stats
+
     # --- CREATE OPERATIONS ---
     @catch_db_error
     def create_laboratory(self, args):
@@ -94,6 +323,7 @@ class Controller:
         self.model.create_object_type(type_name, galaxy_location)
 
     # --- READ ---
+    @catch_db_error
     def read(self, read_from):
     # Зберігаємо оригінальне ім'я (для заголовків)
         original_name = read_from
@@ -109,10 +339,65 @@ class Controller:
             read_from = "object_type"
 
         # Отримуємо дані з бази
-        table = self.model.read(read_from)
+        if self.stream_itersize:
+            table = self.model.read_stream(read_from, itersize=self.stream_itersize)
+        else:
+            table = self.model.read(read_from)
 
         # Передаємо назад оригінальне ім’я для коректного заголовка
-        self.view.output_table(table, original_name)
+        self.view.output_table(table, original_name, chunk_size=self.stream_itersize)
+
+    # --- BROWSE (keyset pagination) ---
+    @catch_db_error
+    def browse(self, read_from):
+        table_name = self.table_names[read_from]
+        cursors = self.page_cursors.setdefault(read_from, [None])
+
+        while True:
+            rows = self.model.read_page(table_name, cursors[-1], self.page_size)
+            self.view.output_table(rows, read_from)
+            self.view.output_page_info(len(cursors), len(rows))
+
+            action = self.view.show_page_navigation()
+            if action == "next":
+                if len(rows) == self.page_size:
+                    cursors.append(rows[-1][0])
+                else:
+                    log.info("This is the last page.")
+            elif action == "previous":
+                if len(cursors) > 1:
+                    cursors.pop()
+                else:
+                    log.info("This is the first page.")
+            elif action == "first":
+                del cursors[1:]
+            else:
+                break
+
+    # --- IMPORT (COPY FROM STDIN) ---
+    @catch_db_error
+    def import_catalogue(self, directory):
+        for table_name, rows, seconds in self.model.import_catalogue(directory):
+            self.view.output_import_result(table_name, rows, seconds)
+
+    @catch_db_error
+    def import_table(self, args):
+        table_name, path = args
+        rows, seconds = self.model.import_csv(table_name, path)
+        self.view.output_import_result(table_name, rows, seconds)
+
+    # --- EXPORT (COPY TO STDOUT) ---
+    @catch_db_error
+    def export_table(self, args):
+        read_from, path, fmt = args
+        rows, seconds = self.model.export_read(self.table_names[read_from], path, fmt)
+        self.view.output_export_result(path, rows, seconds)
+
+    @catch_db_error
+    def export_search(self, args):
+        search_name, search_args, path, fmt = args
+        rows, seconds = self.model.export_search(search_name, search_args, path, fmt)
+        self.view.output_export_result(path, rows, seconds)
 
     # --- UPDATE ---
     @catch_db_error
@@ -123,9 +408,9 @@ class Controller:
         affected = self.model.update_laboratory_field(find_name, new_name)
 
         if affected == 0:
-            print(f"[!INFO!] NO LABORATORY WITH ID={find_name} — nothing was updated.")
+            log.info("No laboratory with id=%s — nothing was updated.", find_name)
         else:
-            print(f"[SUCCESS] Laboratory id={find_name} updated successfully (new name: {new_name})")
+            log.log(SUCCESS, "Laboratory id=%s updated successfully (new name: %s)", find_name, new_name)
    
     @catch_db_error
     def update_researcher(self, args):
@@ -147,9 +432,9 @@ class Controller:
         affected = self.model.update_researcher_field(researcher_id, field, new_value)
 
         if affected == 0:
-            print(f"[INFO] No researcher with id={researcher_id} — nothing was updated.")
+            log.info("No researcher with id=%s — nothing was updated.", researcher_id)
         else:
-            print(f"[SUCCESS] Researcher id={researcher_id} updated: set {field} = {new_value}")
+            log.log(SUCCESS, "Researcher id=%s updated: set %s = %s", researcher_id, field, new_value)
 
 
     @catch_db_error
@@ -171,9 +456,9 @@ class Controller:
         affected = self.model.update_object_field(object_id, field, new_value)
 
         if affected == 0:
-            print(f"[INFO] No object with id={object_id} — nothing was updated.")
+            log.info("No object with id=%s — nothing was updated.", object_id)
         else:
-            print(f"[SUCCESS] Object id={object_id} updated: set {field} = {new_value}")
+            log.log(SUCCESS, "Object id=%s updated: set %s = %s", object_id, field, new_value)
 
 
     @catch_db_error
@@ -192,9 +477,9 @@ class Controller:
         affected = self.model.update_object_type_field(type_id, field, new_value)
 
         if affected == 0:
-            print(f"[INFO] No object_type with id={type_id} — nothing was updated.")
+            log.info("No object_type with id=%s — nothing was updated.", type_id)
         else:
-            print(f"[SUCCESS] Object type id={type_id} updated: set {field} = {new_value}")
+            log.log(SUCCESS, "Object type id=%s updated: set %s = %s", type_id, field, new_value)
 
     # --- DELETE ---
     @catch_db_error
@@ -215,52 +500,111 @@ class Controller:
 
     @catch_db_error
     def task_generate_labs(self, args):
-        # args is n
-        n = int(args)
-        print(f"[TASK2] Generating {n} laboratories...")
-        created = self.model.generate_laboratories(n)
-        print(f"[TASK2] Laboratories inserted (approx): {created}")
+        # args is (n, seed, exact)
+        n, seed, exact = args
+        self._generate("laboratory", "laboratories", self.model.generate_laboratories, n, seed=seed, exact=exact)
 
     @catch_db_error
     def task_generate_researchers(self, args):
-        n = int(args)
-        print(f"[TASK2] Generating {n} researchers...")
-        created = self.model.generate_researchers(n)
-        print(f"[TASK2] Researchers inserted (approx): {created}")
+        n, workers, seed, engine = args
+        self._generate("researcher", "researchers", self.model.generate_researchers, n, workers, seed, engine)
 
     @catch_db_error
     def task_generate_objects(self, args):
-        n = int(args)
-        print(f"[TASK2] Generating {n} objects...")
-        created = self.model.generate_objects(n)
-        print(f"[TASK2] Objects inserted (approx): {created}")
+        n, workers, seed, engine = args
+        self._generate("object", "objects", self.model.generate_objects, n, workers, seed, engine)
 
     @catch_db_error
     def task_generate_object_types(self, args):
-        n = int(args)
-        print(f"[TASK2] Generating {n} objects...")
-        created = self.model.generate_object_types(n)
-        print(f"[TASK2] Objects inserted (approx): {created}")
+        n, workers, seed, engine = args
+        self._generate("object_type", "object types", self.model.generate_object_types, n, workers, seed, engine)
+
+    def _generate(self, table_name, label, generate, n, workers=1, seed=None, engine=None, exact=False):
+        # an interrupted job for the table is offered for resume first
+        job = self.model.unfinished_generation(table_name)
+        t0 = time.time()
+        try:
+            resume = self.view.ask_resume_generation(job) if job and self.interactive else self.batch_resume
+            if job and resume:
+                log.info("Resuming %s: %s/%s rows already committed...", label, job["done"], job["total"])
+                created = self.model.resume_generation(job["id"], workers, progress=self.view.output_generate_progress)
+            else:
+                if job:
+                    self.model.abandon_generation(job["id"])
+                log.info("Generating %s %s with %s worker(s)...", n, label, workers)
+                options = {"progress": self.view.output_generate_progress, "seed": seed}
+                if workers > 1:
+                    options["workers"] = workers
+                if engine:
+                    options["engine"] = engine
+                if exact:
+                    options["exact"] = exact
+                created = generate(n, **options)
+        except KeyboardInterrupt:
+            print()
+            log.info("Interrupted. Committed chunks are kept; choose the same option again to resume.")
+            return
+        print()
+        self.view.output_generate_result(label, created, time.time() - t0)
+
+    @catch_db_error
+    def task_fingerprint(self, _):
+        self.view.output_fingerprint(self.model.dataset_fingerprint())
 
     @catch_db_error
     def task3_search_researchers(self, args):
         table, ms = self.model.search_researchers(*args)
         self.view.output_table(table, "researchers")
         print(f"[TIME] Query executed in {ms:.2f} ms")
+        self.view.output_cache_stats(self.model.cache.stats())
+        self._explain("researchers", args)
 
     @catch_db_error
     def task3_search_objects(self, args):
         table, ms = self.model.search_objects(*args)
         self.view.output_table(table, "objects")
         print(f"[TIME] Query executed in {ms:.2f} ms")
+        self.view.output_cache_stats(self.model.cache.stats())
+        self._explain("objects", args)
 
     @catch_db_error
     def task3_search_labs(self, args):
         table, ms = self.model.search_labs(*args)
 
         if not table:
-            print("[INFO] No labs match your filters.")
+            log.info("No labs match your filters.")
         else:
             self.view.output_table(table, "laboratories")
 
-        print(f"[TIME] Query executed in {ms:.3f} ms")
\ No newline at end of file
+        print(f"[TIME] Query executed in {ms:.3f} ms")
+        self.view.output_cache_stats(self.model.cache.stats())
+        self._explain("labs", args)
+
+    @catch_db_error
+    def task3_search_distance_range(self, args):
+        table, ms = self.model.search_objects_by_distance(*args)
+
+        if not table:
+            log.info("No objects in this distance range.")
+        else:
+            self.view.output_table(table, "objects")
+
+        print(f"[TIME] Query executed in {ms:.2f} ms")
+        self.view.output_cache_stats(self.model.cache.stats())
+        self._explain("distance_range", args)
+
+    @catch_db_error
+    def task3_search_nearest(self, args):
+        table, ms = self.model.search_nearest_objects(*args)
+        self.view.output_table(table, "objects")
+        print(f"[TIME] Query executed in {ms:.2f} ms")
+        self.view.output_cache_stats(self.model.cache.stats())
+        self._explain("nearest", args)
+
+    def _explain(self, search_name, args):
+        if self.explain_searches:
+            self.view.output_explain(self.model.explain_search(search_name, *args))
+
+    def task3_toggle_explain(self, _):
+        self.explain_searches = not self.explain_searches
+        log.info("EXPLAIN ANALYZE mode: %s", "on" if self.explain_searches else "off")
\ No newline at end of file
@@ -0,0 +1,56 @@
+def _node_label(node: dict) -> str:
+    label = node["Node Type"]
+    if "Relation Name" in node:
+        label += f" on {node['Relation Name']}"
+        if node.get("Alias") and node["Alias"] != node["Relation Name"]:
+            label += f" {node['Alias']}"
+    if "Index Name" in node:
+        label += f" using {node['Index Name']}"
+    return label
+
+
+def flatten_plan(plan: dict, depth: int = 0) -> list:
+    """
+    Walks an EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) plan tree depth-first and
+    returns one dict per node with:
+    - estimated vs actual rows (actual = rows per loop * loops) and their ratio
+    - shared buffer hits / reads
+    - self_ms: time spent in the node itself, without its children
+    """
+    loops = plan.get("Actual Loops", 1) or 1
+    total_ms = plan.get("Actual Total Time", 0.0) * loops
+    children = plan.get("Plans", [])
+    children_ms = sum(child.get("Actual Total Time", 0.0) * (child.get("Actual Loops", 1) or 1) for child in children)
+
+    estimated = plan.get("Plan Rows", 0) * loops
+    actual = plan.get("Actual Rows", 0) * loops
+    # how far off the planner was, as a factor >= 1 (x10 = ten times too many or too few)
+    error = max(estimated, 1) / max(actual, 1)
+    error = error if error >= 1 else 1 / error
+
+    nodes = [{
+        "depth": depth,
+        "node": _node_label(plan),
+        "estimated_rows": estimated,
+        "actual_rows": actual,
+        "estimate_error": error,
+        "shared_hit": plan.get("Shared Hit Blocks", 0),
+        "shared_read": plan.get("Shared Read Blocks", 0),
+        "total_ms": total_ms,
+        "self_ms": max(total_ms - children_ms, 0.0),
+    }]
+    for child in children:
+        nodes.extend(flatten_plan(child, depth + 1))
+    return nodes
+
+
+def summarize_explain(result: list) -> dict:
+    # result: the JSON document returned by EXPLAIN ... FORMAT JSON
+    root = result[0]
+    nodes = flatten_plan(root["Plan"])
+    return {
+        "nodes": nodes,
+        "dominant": max(nodes, key=lambda node: node["self_ms"]),
+        "planning_ms": root.get("Planning Time", 0.0),
+        "execution_ms": root.get("Execution Time", 0.0),
+    }
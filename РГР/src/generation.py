@@ -0,0 +1,167 @@
+import hashlib
+import multiprocessing
+import time
+
+from psycopg2 import connect
+
+from .vector_generation import copy_chunk
+
+# bookkeeping for chunked generation: a job per generate_* call and one row per
+# committed chunk; the chunk row is written in the same transaction as the
+# generated rows, so a chunk is either fully there and recorded, or neither
+GENERATION_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS generation_job (
+        id          serial PRIMARY KEY,
+        table_name  text    NOT NULL,
+        total       integer NOT NULL,
+        chunk_size  integer NOT NULL,
+        fk_params   jsonb   NOT NULL,
+        first_id    bigint,
+        seed        bigint,
+        engine      text    NOT NULL DEFAULT 'sql',
+        status      text    NOT NULL DEFAULT 'running',
+        created_at  timestamptz NOT NULL DEFAULT now()
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS generation_chunk (
+        job_id      integer NOT NULL REFERENCES generation_job(id) ON DELETE CASCADE,
+        chunk_no    integer NOT NULL,
+        planned     integer NOT NULL,
+        inserted    integer NOT NULL,
+        PRIMARY KEY (job_id, chunk_no)
+    )
+    """,
+    # job tables created before seeded generation; their jobs (first_id NULL) cannot be resumed
+    "ALTER TABLE generation_job ADD COLUMN IF NOT EXISTS first_id bigint",
+    "ALTER TABLE generation_job ADD COLUMN IF NOT EXISTS seed bigint",
+    "ALTER TABLE generation_job ADD COLUMN IF NOT EXISTS engine text NOT NULL DEFAULT 'sql'",
+]
+
+# "sql": INSERT ... SELECT with random() on the server (generate_queries)
+# "numpy": rows built client-side and sent with COPY (vector_generation)
+GENERATION_ENGINES = ("sql", "numpy")
+
+# (table_name, table_name, n) -> last id of a freshly reserved range of n ids:
+# nextval() gives the first id, setval() moves the sequence past the whole range
+RESERVE_IDS_QUERY = (
+    "SELECT setval(pg_get_serial_sequence(%s, 'id'), "
+    "nextval(pg_get_serial_sequence(%s, 'id')) + %s - 1)"
+)
+
+PROGRESS_POLL_INTERVAL = 0.5
+
+
+def plan_chunks(total: int, chunk_size: int) -> list:
+    # [(chunk_no, rows), ...]; the last chunk takes the remainder
+    return [(chunk_no, min(chunk_size, total - start))
+            for chunk_no, start in enumerate(range(0, total, chunk_size))]
+
+
+def chunk_seed(seed: int, table_name: str, first_id: int) -> float:
+    # setseed() value in [-1, 1] for the chunk whose rows start at first_id;
+    # hashlib, not hash(): the value must be the same in every process and run
+    digest = hashlib.sha256(f"{seed}:{table_name}:{first_id}".encode()).digest()
+    return int.from_bytes(digest[:8], "big") / 2 ** 63 - 1
+
+
+def committed_chunks(cur, job_id: int) -> dict:
+    # chunk_no -> planned rows, for every chunk already committed
+    cur.execute("SELECT chunk_no, planned FROM generation_chunk WHERE job_id = %s", (job_id,))
+    return dict(cur.fetchall())
+
+
+def run_chunks(conn, job: dict, chunks: list, on_chunk=None) -> int:
+    """
+    Runs the job's query once per chunk, each chunk in its own transaction
+    together with its generation_chunk row.
+    Chunks already recorded for the job are skipped, so a rerun after Ctrl-C or
+    a dropped connection continues where the last commit left off.
+    Every chunk gets the fixed id range first_id + chunk_no * chunk_size, and
+    for a seeded job its own setseed() (or NumPy generator), so the rows do not
+    depend on which process runs the chunk or in what order.
+    Returns the number of rows inserted.
+    """
+    cur = conn.cursor()
+    inserted = 0
+    try:
+        done = committed_chunks(cur, job["id"])
+        conn.commit()
+        for chunk_no, rows in chunks:
+            if chunk_no in done:
+                continue
+            first_id = job["first_id"] + chunk_no * job["chunk_size"]
+            if job["engine"] == "numpy":
+                affected = copy_chunk(cur, job["table_name"], job["fk_params"], first_id, rows, job["seed"])
+            else:
+                if job["seed"] is not None:
+                    cur.execute("SELECT setseed(%s)", (chunk_seed(job["seed"], job["table_name"], first_id),))
+                cur.execute(job["query"], (*job["fk_params"], first_id, rows))
+                affected = cur.rowcount
+            cur.execute(
+                "INSERT INTO generation_chunk(job_id, chunk_no, planned, inserted) VALUES (%s, %s, %s, %s)",
+                (job["id"], chunk_no, rows, affected),
+            )
+            conn.commit()
+            inserted += affected
+            if on_chunk is not None:
+                on_chunk(rows)
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+    return inserted
+
+
+def _generate_part(task) -> int:
+    # runs in a worker process: own connection, own transactions
+    conn_kwargs, job, chunks = task
+    conn = connect(**conn_kwargs)
+    try:
+        return run_chunks(conn, job, chunks)
+    finally:
+        conn.close()
+
+
+def generate_parallel(conn_kwargs: dict, job: dict, chunks: list, workers: int, poll=None) -> int:
+    """
+    Deals the chunks round-robin to `workers` processes, each with its own
+    connection, so every worker keeps one backend core busy.
+    fk_params (arrays of existing laboratory / object_type ids) are the same for all
+    workers, so every generated foreign key points at a row that exists.
+    poll() is called every PROGRESS_POLL_INTERVAL seconds while the workers run.
+    """
+    parts = [chunks[i::workers] for i in range(workers) if chunks[i::workers]]
+    tasks = [(conn_kwargs, job, part) for part in parts]
+
+    # spawn: children must not inherit the parent's open pool connections
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(len(tasks)) as pool:
+        result = pool.map_async(_generate_part, tasks)
+        while not result.ready():
+            result.wait(PROGRESS_POLL_INTERVAL)
+            if poll is not None:
+                poll()
+        return sum(result.get())
+
+
+class Progress:
+    # turns "n more rows committed" into progress(done, total, rows_per_s) calls
+    def __init__(self, total: int, done: int = 0, callback=None):
+        self.total = total
+        self.done = done
+        self.callback = callback
+        self._start_done = done
+        self._start = time.monotonic()
+
+    def set(self, done: int):
+        self.done = done
+        if self.callback is not None:
+            elapsed = time.monotonic() - self._start
+            rate = (self.done - self._start_done) / elapsed if elapsed > 0 else 0.0
+            self.callback(self.done, self.total, rate)
+
+    def add(self, rows: int):
+        self.set(self.done + rows)
@@ -0,0 +1,112 @@
+import csv
+import io
+import os
+
+from .distance import parse_distance
+
+
+# table -> columns that may come from a CSV file
+TABLE_COLUMNS = {
+    "laboratory": ("id", "lab_name"),
+    "researcher": ("id", "full_name", "level", "laboratory_id"),
+    "object_type": ("id", "type", "galaxy_location"),
+    "object": ("id", "name", "distance", "laboratory_id", "type_id"),
+}
+
+# (table, column) -> converter from the CSV text to the stored value
+COLUMN_PARSERS = {
+    ("object", "distance"): parse_distance,     # "~8.6 св.р." -> 8.6 (light years)
+}
+
+# catalogue files shipped in the repository root
+CATALOGUE_FILES = {
+    "laboratory": "labolatory.csv",
+    "object_type": "object type.csv",
+    "researcher": "researcher.csv",
+    "object": "object.csv",
+}
+
+# repository root, where the catalogue CSV files live
+DEFAULT_CATALOGUE_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# parents first, so foreign keys are satisfied
+IMPORT_ORDER = ("laboratory", "object_type", "researcher", "object")
+
+
+def normalize_header(header: str) -> str:
+    # "lab name" -> "lab_name", "Full Name" -> "full_name"
+    return header.strip().lower().replace(" ", "_")
+
+
+def map_header(table_name: str, header: list) -> tuple[list, list]:
+    """
+    Matches CSV header cells to table columns.
+    Returns (column names, indexes of the matching CSV cells); unknown CSV columns
+    (e.g. "tools" in labolatory.csv) are skipped.
+    """
+    allowed = TABLE_COLUMNS[table_name]
+    columns, indexes = [], []
+    for index, cell in enumerate(header):
+        column = normalize_header(cell)
+        if column in allowed and column not in columns:
+            columns.append(column)
+            indexes.append(index)
+
+    missing = [c for c in allowed if c != "id" and c not in columns]
+    if missing:
+        raise ValueError(f"CSV for {table_name} has no column(s): {', '.join(missing)}")
+    return columns, indexes
+
+
+class CsvCopyStream:
+    """
+    File-like object for cursor.copy_expert(): reads the source CSV lazily and
+    hands out only the mapped columns, re-encoded as CSV, one buffer at a time.
+    Memory use does not depend on the file size.
+    """
+
+    def __init__(self, source, table_name: str):
+        self.reader = csv.reader(source)
+        self.columns, self.indexes = map_header(table_name, next(self.reader))
+        # (position in the output row, converter) for columns stored in another form than the CSV text
+        self.parsers = [
+            (position, COLUMN_PARSERS[table_name, column])
+            for position, column in enumerate(self.columns)
+            if (table_name, column) in COLUMN_PARSERS
+        ]
+        self.rows = 0
+
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+        self._pending = b""
+        self._done = False
+
+    def _fill(self, size: int):
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        for row in self.reader:
+            if not row:
+                continue
+            values = [row[i] for i in self.indexes]
+            for position, parse in self.parsers:
+                values[position] = parse(values[position])
+            self._writer.writerow(values)
+            self.rows += 1
+            if self._buffer.tell() >= size:
+                break
+        else:
+            self._done = True
+        # bytes, so the result does not depend on the connection's client_encoding
+        self._pending += self._buffer.getvalue().encode("utf-8")
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = 1 << 16
+        if len(self._pending) < size and not self._done:
+            self._fill(size)
+        chunk, self._pending = self._pending[:size], self._pending[size:]
+        return chunk
+
+
+def catalogue_path(directory: str, table_name: str) -> str:
+    return os.path.join(directory, CATALOGUE_FILES[table_name])
@@ -0,0 +1,80 @@
+import logging
+import os
+import random
+import sys
+
+# level between INFO and WARNING for the "[SUCCESS] ..." messages of the menus
+SUCCESS = 25
+logging.addLevelName(SUCCESS, "SUCCESS")
+
+LOG_LEVEL_ENV = "BD_LOG_LEVEL"
+SQL_SAMPLE_ENV = "BD_SQL_SAMPLE"
+
+log = logging.getLogger("bd")
+sql_logger = logging.getLogger("bd.sql")
+
+
+class StructuredFormatter(logging.Formatter):
+    # "[LEVEL] message key=value ...", the fields come from extra={"fields": {...}}
+    def format(self, record):
+        line = f"[{record.levelname}] {record.getMessage()}"
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{key}={value!r}" for key, value in fields.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+class SqlLog:
+    """
+    Sampled statement log on the "bd.sql" logger, at DEBUG level.
+    Hot paths test the plain attribute `enabled` before anything else, so
+    with statement logging off a query costs one attribute lookup: no timing,
+    no formatting and no logger call.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.sample = 1.0
+
+    def configure(self, sample: float):
+        self.sample = min(max(sample, 0.0), 1.0)
+        self.enabled = self.sample > 0 and sql_logger.isEnabledFor(logging.DEBUG)
+
+    def statement(self, query: str, data, ms: float, rows: int):
+        if self.sample < 1.0 and random.random() >= self.sample:
+            return
+        sql_logger.debug("sql", extra={"fields": {
+            "query": " ".join(query.split()),
+            "params": data,
+            "ms": round(ms, 3),
+            "rows": rows,
+        }})
+
+
+sql_log = SqlLog()
+
+
+def configure(level=None, sql_sample=None):
+    """
+    level: DEBUG / INFO / SUCCESS / WARNING / ERROR, default $BD_LOG_LEVEL or INFO.
+    WARNING hides the per-operation [SUCCESS] / [INFO] messages; DEBUG adds
+    the SQL statements.
+    sql_sample: share of statements logged at DEBUG (0..1), default
+    $BD_SQL_SAMPLE or 1.
+    """
+    level = (level or os.environ.get(LOG_LEVEL_ENV) or "INFO").upper()
+    if sql_sample is None:
+        sql_sample = float(os.environ.get(SQL_SAMPLE_ENV) or 1.0)
+
+    if not log.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(StructuredFormatter())
+        log.addHandler(handler)
+        log.propagate = False
+    log.setLevel(level)
+    sql_log.configure(sql_sample)
+
+
+configure()
@@ -1,104 +1,600 @@
-from psycopg2 import connect
+from .pool import ConnectionPool
+from .importer import CsvCopyStream, IMPORT_ORDER, catalogue_path
+from .cache import QueryCache
+from .distance import migrate_distance_column, parse_distance
+from .queries import (
+    DEFAULT_NEAREST_K, DELETE_QUERIES, GENERATE_QUERIES, INSERT_MANY_QUERIES, INSERT_QUERIES, LAB_FILL_QUERY,
+    LAB_NAME_INDEX, LAB_NAME_PATTERN, LAB_NAME_SPACE, READ_KEYS, READ_QUERIES, SEARCH_BUILDERS, UPDATE_QUERIES,
+    search_query,
+)
+from .explain import summarize_explain
+from .log import SUCCESS, log, sql_log
+from .generation import (
+    GENERATION_ENGINES, GENERATION_TABLES, RESERVE_IDS_QUERY, Progress, committed_chunks, generate_parallel,
+    chunk_seed, plan_chunks, run_chunks,
+)
+from . import vector_generation
+from psycopg2.extras import execute_values, Json
+from itertools import islice
+from collections import Counter
+from uuid import uuid4
+from contextlib import contextmanager
+import hashlib
+import threading
+import re
 import time
 
+
+DB_CONFIG = {
+    "database": "postgres",
+    "user": "postgres",
+    "password": "1234",
+    "host": "localhost",
+    "port": "5432",
+}
+
+# rows fetched per round trip by server-side cursors
+DEFAULT_ITERSIZE = 2000
+
+# rows per page for read_page / search_*_page
+DEFAULT_PAGE_SIZE = 50
+
+# bytes sent per COPY round trip
+COPY_BUFFER_SIZE = 1 << 20
+
+# create_many_*: rows per multi-row VALUES statement / rows per commit
+DEFAULT_INSERT_PAGE_SIZE = 1000
+DEFAULT_INSERT_BATCH_SIZE = 10_000
+
+# generate_*: rows per committed chunk
+DEFAULT_GENERATE_CHUNK_SIZE = 50_000
+
+
+class Transaction:
+    # state of one unit of work (Model.begin() .. commit() / rollback())
+    def __init__(self, conn):
+        self.conn = conn
+        self.depth = 1          # nested transaction() blocks joined to this one
+        self.writes = 0
+        self.tables = set()     # tables written, invalidated in the cache on commit
+        self.failed = False     # a statement failed: the block is rolled back
+        self.committed = False
+
+
 class Model:
-    def __init__(self):
-        self.connection = connect(
-            database="postgres",
-            user="postgres",
-            password="1234",
-            host="localhost",
-            port="5432",
+    def __init__(self, min_connections=1, max_connections=10, pool_timeout=30.0, ensure_indexes=True,
+                 use_prepared=True, cache_bytes=64 * 1024 * 1024, cache_ttl=60.0):
+        # every operation checks a connection out of the pool and returns it
+        # when done, so several threads can use one Model at the same time
+        self.pool = ConnectionPool(
+            min_size=min_connections,
+            max_size=max_connections,
+            timeout=pool_timeout,
+            **DB_CONFIG,
         )
 
-        # ======== INSERT QUERIES ========
-        self.insert_queries = {
-            "laboratory": """INSERT INTO laboratory(lab_name) VALUES (%s)""",
-            "researcher": """INSERT INTO researcher(full_name, level, laboratory_id) VALUES (%s, %s, %s)""",
-            "object_type": """INSERT INTO object_type(type, galaxy_location) VALUES (%s, %s)""",
-            "object": """INSERT INTO object(name, distance, laboratory_id, type_id) VALUES (%s, %s, %s, %s)""",
+        # ======== QUERIES (src/queries.py, shared with AsyncModel) ========
+        self.insert_queries = INSERT_QUERIES
+        self.insert_many_queries = INSERT_MANY_QUERIES
+        self.read_queries = READ_QUERIES
+        self.read_keys = READ_KEYS
+        self.delete_queries = DELETE_QUERIES
+        self.update_queries = UPDATE_QUERIES
+        self.generate_queries = GENERATE_QUERIES
+
+        # ======== RESULT CACHE ========
+        # read() and search_*() results, dropped on any write to a table they read;
+        # cache_bytes=0 disables caching
+        self.cache = QueryCache(max_bytes=cache_bytes, ttl=cache_ttl)
+        self.read_tables = {
+            "laboratory": ("laboratory",),
+            "researcher": ("researcher", "laboratory"),
+            "object": ("object", "laboratory", "object_type"),
+            "object_type": ("object_type",),
         }
-
-        # ======== READ QUERIES ========
-        self.read_queries = {
-            "laboratory": "SELECT id, lab_name FROM laboratory",
-            "researcher": "SELECT r.id, r.full_name, r.level, l.lab_name "
-                          "FROM researcher AS r "
-                          "JOIN laboratory AS l ON r.laboratory_id = l.id",
-            "object": "SELECT o.id, o.name, o.distance, l.lab_name, t.type, t.galaxy_location "
-                      "FROM object AS o "
-                      "JOIN laboratory AS l ON o.laboratory_id = l.id "
-                      "JOIN object_type AS t ON o.type_id = t.id",
-            "object_type": "SELECT id, type, galaxy_location FROM object_type",
+        self.search_tables = {
+            "researchers": ("researcher", "laboratory"),
+            "objects": ("object", "laboratory", "object_type"),
+            "labs": ("laboratory", "researcher", "object"),
+            "distance_range": ("object", "laboratory", "object_type"),
+            "nearest": ("object", "laboratory", "object_type"),
         }
 
-        # ======== DELETE QUERIES ========
-        self.delete_queries = {
-            "laboratory": "DELETE FROM laboratory WHERE id = %s",
-            "researcher": "DELETE FROM researcher WHERE id = %s",
-            "object": "DELETE FROM object WHERE id = %s",
-            "object_type": "DELETE FROM object_type WHERE id = %s",
+        # ======== PREPARED STATEMENTS ========
+        # the fixed CRUD queries are PREPAREd once per connection and then EXECUTEd,
+        # so the server skips parse/plan on every call; use_prepared=False turns it off
+        self.use_prepared = use_prepared
+        self.prepared_hits = Counter()
+        self._prepared_lock = threading.Lock()
+        self._statements = {}
+        for table_name, query in self.insert_queries.items():
+            self._register_statement(f"insert_{table_name}", query)
+        for table_name, query in self.read_queries.items():
+            self._register_statement(f"read_{table_name}", query)
+        for table_name, query in self.delete_queries.items():
+            self._register_statement(f"delete_{table_name}", query)
+        for table_name, fields in self.update_queries.items():
+            for field, query in fields.items():
+                self._register_statement(f"update_{table_name}_{field}", query)
+
+        # ======== EXPORT FORMATS ========
+        # JSON lines: one row_to_json() value per line; the CSV quote/delimiter are set
+        # to control characters that never occur in JSON text, so lines come out verbatim
+        self.export_formats = {
+            "csv": b"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER, ENCODING 'UTF8')",
+            "jsonl": b"COPY (SELECT row_to_json(q) FROM ({query}) AS q) TO STDOUT "
+                     b"WITH (FORMAT csv, QUOTE E'\\x01', DELIMITER E'\\x02', ENCODING 'UTF8')",
         }
 
-        # ======== UPDATE QUERIES ========
-        self.update_queries = {
-            "laboratory": {
-                "lab_name": "UPDATE laboratory SET lab_name = %s WHERE id = %s",
-            },
-            "researcher": {
-                "full_name": "UPDATE researcher SET full_name = %s WHERE id = %s",
-                "level": "UPDATE researcher SET level = %s WHERE id = %s",
-                "laboratory_id": "UPDATE researcher SET laboratory_id = %s WHERE id = %s",
-            },
-            "object_type": {
-                "type": "UPDATE object_type SET type = %s WHERE id = %s",
-                "galaxy_location": "UPDATE object_type SET galaxy_location = %s WHERE id = %s",
-            },
-            "object": {
-                "name": "UPDATE object SET name = %s WHERE id = %s",
-                "distance": "UPDATE object SET distance = %s WHERE id = %s",
-                "laboratory_id": "UPDATE object SET laboratory_id = %s WHERE id = %s",
-                "type_id": "UPDATE object SET type_id = %s WHERE id = %s",
-            },
-        }
+        # ======== INDEXES ========
+        # pg_trgm GIN indexes serve the LIKE '%x%' filters of the task-3 searches;
+        # B-tree indexes on the foreign keys serve the joins from the small tables;
+        # the unique index on generated lab names lets generate_laboratories skip taken
+        # names with ON CONFLICT
+        self.index_queries = [
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {LAB_NAME_INDEX} ON laboratory (lab_name) "
+            f"WHERE lab_name ~ '{LAB_NAME_PATTERN}'",
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+            "CREATE INDEX IF NOT EXISTS laboratory_lab_name_trgm_idx ON laboratory USING gin (lab_name gin_trgm_ops)",
+            "CREATE INDEX IF NOT EXISTS object_type_type_trgm_idx ON object_type USING gin (type gin_trgm_ops)",
+            "CREATE INDEX IF NOT EXISTS researcher_full_name_trgm_idx ON researcher USING gin (full_name gin_trgm_ops)",
+            "CREATE INDEX IF NOT EXISTS object_name_trgm_idx ON object USING gin (name gin_trgm_ops)",
+            "CREATE INDEX IF NOT EXISTS researcher_laboratory_id_idx ON researcher (laboratory_id)",
+            "CREATE INDEX IF NOT EXISTS object_laboratory_id_idx ON object (laboratory_id)",
+            "CREATE INDEX IF NOT EXISTS object_type_id_idx ON object (type_id)",
+            # distance comparisons and ORDER BY distance (light years, double precision)
+            "CREATE INDEX IF NOT EXISTS object_distance_idx ON object (distance)",
+        ]
+
+        # ======== SEARCH BUILDERS ========
+        # name -> (builder returning (sql, args), key column for ORDER BY)
+        self.search_builders = SEARCH_BUILDERS
+
+        self._generation_ready = False
+
+        # current Model.transaction() of each thread
+        self._local = threading.local()
+
+        if ensure_indexes:
+            self.ensure_indexes()
 
     # ======== BASIC METHODS ========
 
     def disconnect(self):
-        if self.connection and self.connection.closed == 0:
-            self.connection.close()
+        if self.in_transaction():
+            self.rollback()
+        self.pool.closeall()
+
+    def _register_statement(self, name, query):
+        # "%s" placeholders -> "$1, $2, ..." for PREPARE
+        counter = iter(range(1, query.count("%s") + 1))
+        prepare_sql = re.sub(r"%s", lambda _: f"${next(counter)}", query)
+        self._statements[query] = (name, prepare_sql, query.count("%s"))
+
+    def _run(self, cur, query, data):
+        if not sql_log.enabled:
+            self._run_statement(cur, query, data)
+            return
+        t0 = time.perf_counter()
+        self._run_statement(cur, query, data)
+        sql_log.statement(query, data, (time.perf_counter() - t0) * 1000, cur.rowcount)
+
+    def _run_statement(self, cur, query, data):
+        statement = self._statements.get(query) if self.use_prepared else None
+        if statement is None:
+            cur.execute(query, data)
+            return
+
+        name, prepare_sql, n_params = statement
+        conn = cur.connection
+        if name not in conn.prepared:
+            # PREPARE is not transactional: the statement survives rollbacks
+            cur.execute(f"PREPARE {name} AS {prepare_sql}")
+            conn.prepared.add(name)
+
+        if n_params:
+            cur.execute(f"EXECUTE {name}({', '.join(['%s'] * n_params)})", data)
+        else:
+            cur.execute(f"EXECUTE {name}")
+
+        with self._prepared_lock:
+            self.prepared_hits[name] += 1
+
+    def prepared_stats(self) -> dict:
+        # statement name -> number of EXECUTEs
+        with self._prepared_lock:
+            return dict(self.prepared_hits)
+
+    def ensure_indexes(self):
+        # every statement runs in its own transaction: a missing extension
+        # (e.g. no contrib package installed) must not block the other indexes
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            try:
+                # the distance index needs the numeric column first
+                if migrate_distance_column(cur):
+                    log.info("object.distance converted to double precision (light years).")
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                log.warning("Distance column migration failed: %s %s", type(e).__name__, str(e).splitlines()[0])
+
+            trigram_available = True
+            for query in self.index_queries:
+                if not trigram_available and "gin_trgm_ops" in query:
+                    continue
+                try:
+                    cur.execute(query)
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    if "pg_trgm" in query:
+                        trigram_available = False
+                        log.warning("pg_trgm is not available, LIKE searches will scan the tables.")
+                    else:
+                        log.warning("Index setup failed: %s %s", type(e).__name__, str(e).splitlines()[0])
+            cur.close()
+
+    def analyze(self, table_name):
+        # fresh statistics after bulk loads, so the planner picks the indexes
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"ANALYZE {table_name}")
+            conn.commit()
+            cur.close()
+
+    @staticmethod
+    def _written_tables(query: str) -> set:
+        return set(re.findall(r"(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM)\s+(\w+)", query, re.IGNORECASE))
+
+    # ======== TRANSACTIONS ========
+
+    def current_transaction(self):
+        # the open Transaction of this thread, or None
+        return getattr(self._local, "tx", None)
+
+    def in_transaction(self) -> bool:
+        return self.current_transaction() is not None
+
+    def begin(self) -> Transaction:
+        """
+        Starts a unit of work: until commit() / rollback(), every read and
+        write of this thread runs on one connection in one transaction, so
+        the per-statement commits (one fsync each) become a single commit.
+        A failed statement (the model prints the error and returns 0 / [] as
+        usual) marks the transaction failed: later statements raise, and
+        commit() rolls everything back.
+        Bulk operations (create_many_*, generate_*, import_*) and streams keep
+        their own connections and commits.
+        """
+        if self.in_transaction():
+            raise RuntimeError("A transaction is already open")
+        tx = Transaction(self.pool.getconn())
+        self._local.tx = tx
+        return tx
+
+    def commit(self) -> bool:
+        # ends the open unit of work; rolls it back instead if a statement failed
+        tx = self._end_transaction()
+        if tx.failed:
+            self._release(tx, tx.conn.rollback)
+        else:
+            self._release(tx, tx.conn.commit)
+            tx.committed = True
+            self.cache.invalidate(tx.tables)
+        return tx.committed
+
+    def rollback(self):
+        tx = self._end_transaction()
+        self._release(tx, tx.conn.rollback)
+
+    def _release(self, tx, end):
+        # end() is the connection's commit or rollback; the connection goes back to
+        # the pool either way, but one whose COMMIT / ROLLBACK failed is in an
+        # unknown state (e.g. the server went away), so it is closed, not reused
+        broken = True
+        try:
+            end()
+            broken = False
+        finally:
+            self.pool.putconn(tx.conn, close=broken)
+
+    def _end_transaction(self) -> Transaction:
+        tx = self.current_transaction()
+        if tx is None:
+            raise RuntimeError("No open transaction")
+        self._local.tx = None
+        return tx
+
+    @contextmanager
+    def transaction(self):
+        """
+        begin() .. commit() around a block; an exception in the block rolls it
+        back. Check tx.committed afterwards. Nested blocks join the outer one.
+
+            with model.transaction() as tx:
+                model.update_object_field(5, "name", "M31")
+                model.delete_object(6)
+        """
+        tx = self.current_transaction()
+        if tx is not None:
+            tx.depth += 1
+        else:
+            tx = self.begin()
+        try:
+            yield tx
+        except BaseException:
+            tx.failed = True
+            raise
+        finally:
+            tx.depth -= 1
+            if tx.depth == 0:
+                self.commit()
+
+    @contextmanager
+    def _connection(self):
+        # (connection, transaction): the open transaction's connection, or a pooled one
+        tx = self.current_transaction()
+        if tx is not None:
+            if tx.failed:
+                raise RuntimeError("The transaction already failed and will be rolled back")
+            yield tx.conn, tx
+        else:
+            with self.pool.connection() as conn:
+                yield conn, None
+
+    def _cached_select(self, key, tables, loader):
+        # returns (rows, hit); loader() runs the query on a miss
+        if not self.cache.enabled or self.current_transaction() is not None:
+            # inside a transaction the cache may not reflect its uncommitted writes
+            return loader(), False
+        hit, rows = self.cache.get(key)
+        if hit:
+            return rows, True
+        version = self.cache.version(tables)
+        rows = loader()
+        self.cache.put(key, rows, tables, version)
+        return rows, False
+
+    def _fetch(self, query: str, data=None) -> list:
+        with self._connection() as (conn, tx):
+            cur = conn.cursor()
+            try:
+                self._run(cur, query, data or ())
+                rows = cur.fetchall()
+                if tx is None:
+                    conn.commit()
+                return rows
+            except Exception:
+                if tx is None:
+                    conn.rollback()
+                else:
+                    tx.failed = True
+                raise
+            finally:
+                cur.close()
 
     def _execute_select(self, query: str, data=None) -> list:
-        cur = self.connection.cursor()
         try:
-            cur.execute(query, data or ())
-            rows = cur.fetchall()
-            cur.close()
-            return rows
+            return self._fetch(query, data)
         except Exception as e:
-            print(f"\n Unexpected error in SELECT: {type(e).__name__} {e}\n")
-            self.connection.rollback()
-            cur.close()
+            log.error("Unexpected error in SELECT: %s %s", type(e).__name__, e)
             return []
 
     def _execute_modify(self, query: str, data: tuple):
-        cur = self.connection.cursor()
         try:
-            print(f"[DEBUG] Executing SQL: {query}")
-            print(f"[DEBUG] With data: {data}")
+            with self._connection() as (conn, tx):
+                cur = conn.cursor()
+                try:
+                    self._run(cur, query, data)
+                    if tx is None:
+                        conn.commit()
+                        self.cache.invalidate(self._written_tables(query))
+                    else:
+                        tx.writes += 1
+                        tx.tables |= self._written_tables(query)
+                    return cur.rowcount
+
+                except Exception:
+                    if tx is None:
+                        conn.rollback()     # ?? CRITICAL FIX
+                    else:
+                        tx.failed = True
+                    raise
+                finally:
+                    cur.close()
 
-            cur.execute(query, data)
-            self.connection.commit()
+        except Exception as e:
+            log.error("Unexpected error in modify-query: %s %s", type(e).__name__, e)
+            return 0
 
-            affected = cur.rowcount
+    def _execute_stream(self, query: str, data=None, itersize=DEFAULT_ITERSIZE):
+        # named (server-side) cursor: rows arrive in batches of itersize,
+        # the full result never sits in client memory; inside a transaction the
+        # cursor runs on its connection, so it sees the uncommitted writes.
+        # An error, even after some rows were yielded, is raised to the consumer
+        # once the cursor is cleaned up, so a cut-off result never looks complete
+        with self._connection() as (conn, tx):
+            cur = conn.cursor(name=f"stream_{uuid4().hex}")
+            cur.itersize = itersize
+            try:
+                cur.execute(query, data or ())
+                yield from cur
+            except Exception:
+                if tx is not None:
+                    tx.failed = True
+                raise
+            finally:
+                if not conn.closed:
+                    try:
+                        cur.close()
+                    except Exception:
+                        pass
+                    if tx is None:
+                        conn.rollback()
+
+    def _execute_insert_many(self, query: str, rows, page_size: int, batch_size: int) -> list:
+        # one commit per batch_size rows; returns ids of all committed rows
+        ids = []
+        rows = iter(rows)
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            try:
+                while True:
+                    batch = list(islice(rows, batch_size))
+                    if not batch:
+                        break
+                    inserted = execute_values(cur, query, batch, page_size=page_size, fetch=True)
+                    conn.commit()
+                    self.cache.invalidate(self._written_tables(query))
+                    ids.extend(row[0] for row in inserted)
+            except Exception as e:
+                log.error("Unexpected error in insert-many: %s %s", type(e).__name__, e)
+                log.info("%d rows were committed before the error.", len(ids))
+                conn.rollback()
+            finally:
+                cur.close()
+        return ids
+
+    def _ensure_generation_tables(self):
+        if self._generation_ready:
+            return
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            for query in GENERATION_TABLES:
+                cur.execute(query)
+            conn.commit()
             cur.close()
-            return affected
+        self._generation_ready = True
 
-        except Exception as e:
-            print(f"\n Unexpected error in modify-query: {type(e).__name__} {e}\n")
-            self.connection.rollback()     # ?? CRITICAL FIX
+    def _execute_generate(self, table_name: str, fk_params: tuple, n: int, workers: int = 1,
+                          chunk_size: int = DEFAULT_GENERATE_CHUNK_SIZE, progress=None, seed=None, engine: str = "sql"):
+        """
+        Records a generation job and runs it chunk by chunk.
+        The job reserves the id range for all n rows up front, so row ids do not
+        depend on how many workers run it. With a seed, the same seed, n and
+        chunk_size on the same starting data give the same rows, whatever the
+        worker count or how often the job was interrupted and resumed.
+        engine is one of GENERATION_ENGINES; both engines give valid rows of the
+        same shape, but not the same rows for one seed.
+        """
+        if engine not in GENERATION_ENGINES:
+            raise ValueError(f"Unknown generation engine: {engine}")
+        if engine == "numpy" and not vector_generation.available():
+            raise ValueError("The numpy generation engine needs numpy installed")
+        if workers > 1 and seed is None:
+            # enough chunks to keep every worker busy; a seeded job keeps its
+            # chunk boundaries, they decide which random sequence each row gets
+            chunk_size = max(1, min(chunk_size, -(-n // workers)))
+
+        job_id, _ = self._create_generation_job(table_name, fk_params, n, chunk_size, seed, engine)
+        return self._run_generation_job(job_id, workers, progress)
+
+    def _create_generation_job(self, table_name: str, fk_params: tuple, n: int, chunk_size: int, seed=None,
+                               engine: str = "sql"):
+        # reserves ids for n rows and records the job; returns (job_id, first_id)
+        self._ensure_generation_tables()
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(RESERVE_IDS_QUERY, (table_name, table_name, n))
+                first_id = cur.fetchone()[0] - n + 1
+                cur.execute(
+                    "INSERT INTO generation_job(table_name, total, chunk_size, fk_params, first_id, seed, engine) "
+                    "VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING id",
+                    (table_name, n, chunk_size, Json(list(fk_params)), first_id, seed, engine),
+                )
+                job_id = cur.fetchone()[0]
+                conn.commit()
+                return job_id, first_id
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cur.close()
+
+    def _run_generation_job(self, job_id: int, workers: int = 1, progress=None):
+        """
+        Generates the chunks of a job that are not committed yet.
+        Each chunk is its own transaction, so an interrupted job keeps everything
+        committed so far and a rerun inserts only the missing chunks.
+        progress(done_rows, total_rows, rows_per_s) is called as chunks commit.
+        """
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT table_name, total, chunk_size, fk_params, first_id, seed, engine "
+                "FROM generation_job WHERE id = %s",
+                (job_id,),
+            )
+            table_name, total, chunk_size, fk_params, first_id, seed, engine = cur.fetchone()
+            done = committed_chunks(cur, job_id)
+            conn.commit()
+            cur.close()
+
+        job = {
+            "id": job_id,
+            "table_name": table_name,
+            "query": self.generate_queries[table_name],
+            "fk_params": tuple(fk_params),
+            "chunk_size": chunk_size,
+            "first_id": first_id,
+            "seed": seed,
+            "engine": engine,
+        }
+        chunks = plan_chunks(total, chunk_size)
+        tracker = Progress(total, sum(done.values()), progress)
+        if table_name == "laboratory":
+            # one process: with two chunks drawing the same name, which one keeps
+            # it would depend on commit order, and seeded runs would differ
+            workers = 1
+
+        def poll():
+            with self.pool.connection() as poll_conn:
+                poll_cur = poll_conn.cursor()
+                tracker.set(sum(committed_chunks(poll_cur, job_id).values()))
+                poll_conn.commit()
+                poll_cur.close()
+
+        try:
+            if workers > 1 and len(chunks) - len(done) > 1:
+                inserted = generate_parallel(DB_CONFIG, job, chunks, workers, poll)
+                poll()
+            else:
+                with self.pool.connection() as conn:
+                    inserted = run_chunks(conn, job, chunks, tracker.add)
+        finally:
+            # committed chunks are visible even if the job was interrupted
+            self.cache.invalidate((table_name,))
+
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute("UPDATE generation_job SET status = 'done' WHERE id = %s", (job_id,))
+            conn.commit()
             cur.close()
-            return 0
+
+        self.analyze(table_name)
+        return inserted
+
+    def _execute_search(self, query: str, data) -> tuple[list, float]:
+        with self._connection() as (conn, tx):
+            t0 = time.time()
+            cur = conn.cursor()
+            try:
+                cur.execute(query, data)
+                rows = cur.fetchall()
+                ms = (time.time() - t0) * 1000
+                if tx is None:
+                    conn.commit()
+                return rows, ms
+            except Exception:
+                if tx is None:
+                    conn.rollback()
+                else:
+                    tx.failed = True
+                raise
+            finally:
+                cur.close()
 
 
     # ======== CRUD OPERATIONS ========
@@ -114,11 +610,46 @@ class Model:
         self._execute_modify(self.insert_queries["object_type"], (type_name, galaxy_location))
 
     def create_object(self, name, distance, laboratory_id, type_id):
+        # distance: light years, or catalogue text such as "~8.6 св.р."
+        distance = parse_distance(distance)
         self._execute_modify(self.insert_queries["object"], (name, distance, laboratory_id, type_id))
 
+    ## CREATE MANY (multi-row VALUES, returns new ids)
+    def create_many_laboratories(self, rows, page_size=DEFAULT_INSERT_PAGE_SIZE, batch_size=DEFAULT_INSERT_BATCH_SIZE):
+        # rows: iterable of (lab_name,)
+        return self._execute_insert_many(self.insert_many_queries["laboratory"], rows, page_size, batch_size)
+
+    def create_many_researchers(self, rows, page_size=DEFAULT_INSERT_PAGE_SIZE, batch_size=DEFAULT_INSERT_BATCH_SIZE):
+        # rows: iterable of (full_name, level, laboratory_id)
+        return self._execute_insert_many(self.insert_many_queries["researcher"], rows, page_size, batch_size)
+
+    def create_many_object_types(self, rows, page_size=DEFAULT_INSERT_PAGE_SIZE, batch_size=DEFAULT_INSERT_BATCH_SIZE):
+        # rows: iterable of (type_name, galaxy_location)
+        return self._execute_insert_many(self.insert_many_queries["object_type"], rows, page_size, batch_size)
+
+    def create_many_objects(self, rows, page_size=DEFAULT_INSERT_PAGE_SIZE, batch_size=DEFAULT_INSERT_BATCH_SIZE):
+        # rows: iterable of (name, distance, laboratory_id, type_id)
+        rows = ((name, parse_distance(distance), lab_id, type_id) for name, distance, lab_id, type_id in rows)
+        return self._execute_insert_many(self.insert_many_queries["object"], rows, page_size, batch_size)
+
     ## READ
     def read(self, table_name):
-        return self._execute_select(self.read_queries[table_name])
+        query = self.read_queries[table_name]
+        try:
+            rows, _ = self._cached_select((query, ()), self.read_tables[table_name], lambda: self._fetch(query))
+            return rows
+        except Exception as e:
+            log.error("Unexpected error in SELECT: %s %s", type(e).__name__, e)
+            return []
+
+    def read_page(self, table_name, after_id=None, limit=DEFAULT_PAGE_SIZE):
+        # keyset pagination: seek past the last seen id instead of OFFSET,
+        # so every page is one index range scan no matter how deep it is
+        key = self.read_keys[table_name]
+        query = self.read_queries[table_name]
+        if after_id is None:
+            return self._execute_select(f"{query} ORDER BY {key} LIMIT %s", (limit,))
+        return self._execute_select(f"{query} WHERE {key} > %s ORDER BY {key} LIMIT %s", (after_id, limit))
 
     ## UPDATE
     def update_laboratory_field(self, lab_id, new_name):
@@ -145,6 +676,8 @@ class Model:
         query = self.update_queries["object"].get(field)
         if not query:
             raise ValueError(f"Unknown field for object: {field}")
+        if field == "distance":
+            new_value = parse_distance(new_value)
         affected = self._execute_modify(query, (new_value, object_id))
         return affected
     ## DELETE
@@ -156,282 +689,337 @@ class Model:
     def delete_laboratory(self, lab_id):
         affected = self._execute_modify(self.delete_queries["laboratory"], (lab_id,))
         if affected == 0:
-            print(f"[INFO] No laboratory with id={lab_id} nothing deleted.")
+            log.info("No laboratory with id=%s nothing deleted.", lab_id)
         else:
-            print(f"[SUCCESS] Laboratory id={lab_id} deleted successfully.")
+            log.log(SUCCESS, "Laboratory id=%s deleted successfully.", lab_id)
         return affected
 
 
     def delete_researcher(self, researcher_id):
         affected = self._execute_modify(self.delete_queries["researcher"], (researcher_id,))
         if affected == 0:
-            print(f"[INFO] No researcher with id={researcher_id} nothing deleted.")
+            log.info("No researcher with id=%s nothing deleted.", researcher_id)
         else:
-            print(f"[SUCCESS] Researcher id={researcher_id} deleted successfully.")
+            log.log(SUCCESS, "Researcher id=%s deleted successfully.", researcher_id)
         return affected
 
 
     def delete_object(self, object_id):
         affected = self._execute_modify(self.delete_queries["object"], (object_id,))
         if affected == 0:
-            print(f"[INFO] No object with id={object_id} nothing deleted.")
+            log.info("No object with id=%s nothing deleted.", object_id)
         else:
-            print(f"[SUCCESS] Object id={object_id} deleted successfully.")
+            log.log(SUCCESS, "Object id=%s deleted successfully.", object_id)
         return affected
 
 
     def delete_object_type(self, type_id):
         affected = self._execute_modify(self.delete_queries["object_type"], (type_id,))
         if affected == 0:
-            print(f"[INFO] No object_type with id={type_id} nothing deleted.")
+            log.info("No object_type with id=%s nothing deleted.", type_id)
         else:
-            print(f"[SUCCESS] Object type id={type_id} deleted successfully.")
+            log.log(SUCCESS, "Object type id=%s deleted successfully.", type_id)
         return affected
 
 
-    def generate_laboratories(self, n: int):
-        query = """
-        WITH gen AS (
-            SELECT
-                chr(65 + trunc(random()*26)::int) ||
-                chr(65 + trunc(random()*26)::int) ||
-                chr(65 + trunc(random()*26)::int) ||
-                '-' ||
-                (ARRAY['L','O','I','R'])[floor(random()*4)::int + 1] AS lab_name
-            FROM generate_series(1, %s)
-        )
-        INSERT INTO laboratory(lab_name)
-        SELECT DISTINCT lab_name
-        FROM gen
-        WHERE lab_name NOT IN (SELECT lab_name FROM laboratory);
-        """
-
-        cur = self.connection.cursor()
-        cur.execute(query, (n,))
-        self.connection.commit()
-
-        rowcount = cur.rowcount
-        cur.close()
-        return rowcount
-
-    def generate_researchers(self, n: int):
+    def generate_laboratories(self, n: int, chunk_size: int = DEFAULT_GENERATE_CHUNK_SIZE, progress=None,
+                              seed=None, exact: bool = False):
+        # names drawn twice or already taken are skipped, so a run inserts up to n rows;
+        # exact=True then gives the ids left unused in the job's range fresh names
+        # until exactly n new laboratories exist (one id range, one job)
+        self._require_lab_name_index()
+        if not exact:
+            return self._execute_generate("laboratory", (), n, 1, chunk_size, progress, seed)
+
+        taken = self._fetch("SELECT count(*) FROM laboratory WHERE lab_name ~ %s", (LAB_NAME_PATTERN,))[0][0]
+        if LAB_NAME_SPACE - taken < n:
+            raise ValueError(f"Only {LAB_NAME_SPACE - taken} unused generated laboratory names left, {n} requested")
+
+        job_id, first_id = self._create_generation_job("laboratory", (), n, chunk_size, seed)
+        inserted = self._run_generation_job(job_id, 1, progress)
+        fill_pass = 0
+        while inserted < n:
+            fill_pass += 1
+            inserted += self._fill_laboratories(first_id, first_id + n - 1, seed, fill_pass)
+        return inserted
+
+    def _fill_laboratories(self, first_id: int, last_id: int, seed, fill_pass: int) -> int:
+        # one LAB_FILL_QUERY pass over the range; a seeded run seeds every pass differently
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            try:
+                if seed is not None:
+                    cur.execute("SELECT setseed(%s)", (chunk_seed(seed, "laboratory:fill", first_id + fill_pass),))
+                cur.execute(LAB_FILL_QUERY, (first_id, last_id))
+                conn.commit()
+                self.cache.invalidate(("laboratory",))
+                return cur.rowcount
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cur.close()
+
+    def _require_lab_name_index(self):
+        # without the index ON CONFLICT has nothing to conflict with and duplicate names go in
+        if self._fetch("SELECT to_regclass(%s)", (LAB_NAME_INDEX,))[0][0] is None:
+            raise RuntimeError(
+                f"Index {LAB_NAME_INDEX} is missing, so generated laboratory names would not be unique. "
+                "Remove the duplicate generated names and restart to create it."
+            )
+
+    def generate_researchers(self, n: int, workers: int = 1, chunk_size: int = DEFAULT_GENERATE_CHUNK_SIZE,
+                             progress=None, seed=None, engine: str = "sql"):
         # Get all existing laboratory IDs
-        lab_query = "SELECT id FROM laboratory;"
+        lab_query = "SELECT id FROM laboratory ORDER BY id;"
         lab_ids = self._execute_select(lab_query)
 
         if not lab_ids:
-            print("[ERROR] Cannot generate researchers: no laboratories exist.")
+            log.error("Cannot generate researchers: no laboratories exist.")
             return 0
 
         flat_ids = [row[0] for row in lab_ids]
 
-        sql = """
-        WITH params AS (
-            SELECT %s::int[] AS lab_ids, %s::int AS n
-        ),
-        gen AS (
-            SELECT
-                -- Random full name: 5 uppercase letters
-                chr(65 + floor(random()*26)::int) ||
-                chr(65 + floor(random()*26)::int) ||
-                chr(65 + floor(random()*26)::int) ||
-                chr(65 + floor(random()*26)::int) ||
-                chr(65 + floor(random()*26)::int) AS full_name,
-
-                -- Random research level
-                (ARRAY['Junior','Middle','Senior','Lead'])[floor(random()*4)::int + 1] AS level,
-
-                -- Random lab id chosen from provided lab_ids array
-                params.lab_ids[floor(random() * array_length(params.lab_ids, 1))::int + 1] AS lab_id
-
-            FROM params, generate_series(1, params.n)
-        )
-        INSERT INTO researcher(full_name, level, laboratory_id)
-        SELECT full_name, level, lab_id
-        FROM gen;
-        """
-
-        cur = self.connection.cursor()
-        # pass (lab_ids_array, n)  note the order matches params in SQL
-        cur.execute(sql, (flat_ids, n))
-        self.connection.commit()
-        affected = cur.rowcount
-        cur.close()
+        # pass (lab_ids_array, n) — note the order matches params in SQL
+        return self._execute_generate("researcher", (flat_ids,), n, workers, chunk_size, progress, seed, engine)
 
-        return affected
 
-
-    def generate_objects(self, n: int):
+    def generate_objects(self, n: int, workers: int = 1, chunk_size: int = DEFAULT_GENERATE_CHUNK_SIZE,
+                         progress=None, seed=None, engine: str = "sql"):
         # get lab IDs
-        lab_ids = self._execute_select("SELECT id FROM laboratory")
+        lab_ids = self._execute_select("SELECT id FROM laboratory ORDER BY id")
         if not lab_ids:
-            print("[ERROR] Cannot generate objects: no laboratories exist.")
+            log.error("Cannot generate objects: no laboratories exist.")
             return 0
 
         flat_labs = [row[0] for row in lab_ids]
 
         # get type IDs
-        type_ids = self._execute_select("SELECT id FROM object_type")
+        type_ids = self._execute_select("SELECT id FROM object_type ORDER BY id")
         if not type_ids:
-            print("[ERROR] Cannot generate objects: no object types exist.")
+            log.error("Cannot generate objects: no object types exist.")
             return 0
 
         flat_types = [row[0] for row in type_ids]
 
-        sql = """
-        WITH params AS (
-            SELECT %s::int[] AS lab_ids,
-                   %s::int[] AS type_ids,
-                   %s::int    AS n
-        ),
-        gen AS (
-            SELECT
-                -- random object name
-                chr(65 + floor(random()*26)::int) ||
-                chr(65 + floor(random()*26)::int) ||
-                chr(65 + floor(random()*26)::int) ||
-                chr(65 + floor(random()*26)::int) ||
-                chr(65 + floor(random()*26)::int) AS name,
-
-                -- random distance between 1,000 and 1,000,000,000
-                (random() * 999999000 + 1000)::int AS distance,
-
-                -- random lab
-                params.lab_ids[
-                    floor(random() * array_length(params.lab_ids, 1))::int + 1
-                ] AS lab_id,
-
-                -- random type
-                params.type_ids[
-                    floor(random() * array_length(params.type_ids, 1))::int + 1
-                ] AS type_id
-
-            FROM params, generate_series(1, params.n)
-        )
-        INSERT INTO object(name, distance, laboratory_id, type_id)
-        SELECT name, distance, lab_id, type_id
-        FROM gen;
-        """
+        return self._execute_generate("object", (flat_labs, flat_types), n, workers, chunk_size, progress, seed,
+                                      engine)
 
-        cur = self.connection.cursor()
-        cur.execute(sql, (flat_labs, flat_types, n))
-        self.connection.commit()
 
-        affected = cur.rowcount
-        cur.close()
-        return affected
+    def generate_object_types(self, n: int, workers: int = 1, chunk_size: int = DEFAULT_GENERATE_CHUNK_SIZE,
+                              progress=None, seed=None, engine: str = "sql"):
+        return self._execute_generate("object_type", (), n, workers, chunk_size, progress, seed, engine)
 
+    # ======== RESUMABLE GENERATION JOBS ========
 
-    def generate_object_types(self, n: int):
-        
-        sql = """
-        WITH gen AS (
-            SELECT
-                -- random type name (5 LETTERS)
-                chr(65 + floor(random()*26)::int) ||
-                chr(65 + floor(random()*26)::int) ||
-                chr(65 + floor(random()*26)::int) ||
-                chr(65 + floor(random()*26)::int) ||
-                chr(65 + floor(random()*26)::int)     AS type,
-
-                -- random location (5 LETTERS)
-                chr(65 + floor(random()*26)::int) ||
-                chr(65 + floor(random()*26)::int) ||
-                chr(65 + floor(random()*26)::int) ||
-                chr(65 + floor(random()*26)::int) ||
-                chr(65 + floor(random()*26)::int)     AS galaxy_location
-            FROM generate_series(1, %s)
+    def unfinished_generation(self, table_name: str):
+        # the latest interrupted job for the table as a dict, or None
+        self._ensure_generation_tables()
+        rows = self._fetch(
+            "SELECT j.id, j.total, j.chunk_size, COALESCE(SUM(c.planned), 0) "
+            "FROM generation_job AS j "
+            "LEFT JOIN generation_chunk AS c ON c.job_id = j.id "
+            "WHERE j.table_name = %s AND j.status = 'running' AND j.first_id IS NOT NULL "
+            "GROUP BY j.id ORDER BY j.id DESC LIMIT 1",
+            (table_name,),
         )
-        INSERT INTO object_type(type, galaxy_location)
-        SELECT type, galaxy_location FROM gen;
-        """
-
-        cur = self.connection.cursor()
-        cur.execute(sql, (n,))
-        self.connection.commit()
+        if not rows:
+            return None
+        job_id, total, chunk_size, done = rows[0]
+        return {"id": job_id, "table_name": table_name, "total": total, "chunk_size": chunk_size, "done": done}
+
+    def abandon_generation(self, job_id: int):
+        # rows of the committed chunks stay; the job is just no longer offered for resume
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute("UPDATE generation_job SET status = 'abandoned' WHERE id = %s", (job_id,))
+            conn.commit()
+            cur.close()
 
-        affected = cur.rowcount
-        cur.close()
-        return affected
+    def resume_generation(self, job_id: int, workers: int = 1, progress=None):
+        return self._run_generation_job(job_id, workers, progress)
 
-    def search_researchers(self, lab_like, level):
-        sql = """
-        SELECT r.id, r.full_name, r.level, l.lab_name
-        FROM researcher r
-        JOIN laboratory l ON r.laboratory_id = l.id
-        WHERE
-            (%s = '-' OR l.lab_name LIKE %s)
-            AND (%s = '-' OR r.level = %s)
-        ORDER BY r.id;
+    def dataset_fingerprint(self) -> dict:
+        """
+        Row count and content hash per table plus one hash for the whole dataset.
+        Every row (ids included) is hashed with md5 and the hashes are summed, so
+        the result does not depend on physical row order and needs no sort.
+        Two databases generated with the same seed from the same starting state
+        have the same fingerprint.
+        """
+        fingerprint = {}
+        combined = hashlib.md5()
+        for table_name in IMPORT_ORDER:
+            count, total = self._fetch(
+                f"SELECT count(*), COALESCE(sum(('x' || left(md5(t::text), 15))::bit(60)::bigint), 0) "
+                f"FROM {table_name} AS t"
+            )[0]
+            digest = hashlib.md5(f"{count}:{total}".encode()).hexdigest()
+            fingerprint[table_name] = {"rows": count, "hash": digest}
+            combined.update(f"{table_name}:{digest};".encode())
+        fingerprint["dataset"] = combined.hexdigest()
+        return fingerprint
+
+    # ======== CSV IMPORT (COPY FROM STDIN) ========
+
+    def import_csv(self, table_name, path):
+        """
+        Streams a catalogue CSV into table_name with COPY ... FROM STDIN.
+        Returns (rows imported, seconds). The whole file is one transaction.
         """
-
-        args = [
-            lab_like, f"%{lab_like}%",
-            level, level
-        ]
-
         t0 = time.time()
-        cur = self.connection.cursor()
-        cur.execute(sql, args)
-        rows = cur.fetchall()
-        ms = (time.time() - t0) * 1000
-        cur.close()
+        with open(path, newline="", encoding="utf-8-sig") as source:
+            stream = CsvCopyStream(source, table_name)
+            sql = f"COPY {table_name}({', '.join(stream.columns)}) FROM STDIN WITH (FORMAT csv, ENCODING 'UTF8')"
+
+            with self.pool.connection() as conn:
+                cur = conn.cursor()
+                try:
+                    cur.copy_expert(sql, stream, size=COPY_BUFFER_SIZE)
+                    if "id" in stream.columns:
+                        # explicit ids were loaded: move the serial past them
+                        cur.execute(
+                            f"SELECT setval(pg_get_serial_sequence('{table_name}', 'id'), "
+                            f"GREATEST((SELECT max(id) FROM {table_name}), 1))"
+                        )
+                    conn.commit()
+                    self.cache.invalidate((table_name,))
+                except Exception:
+                    conn.rollback()
+                    raise
+                finally:
+                    cur.close()
+
+        return stream.rows, time.time() - t0
+
+    def import_catalogue(self, directory):
+        # all four catalogue files, parents before children; yields (table, rows, seconds)
+        for table_name in IMPORT_ORDER:
+            yield (table_name, *self.import_csv(table_name, catalogue_path(directory, table_name)))
+
+    # ======== EXPORT (COPY TO STDOUT) ========
+
+    def _export(self, query, params, path, fmt):
+        """
+        Streams the result of query straight into a file with COPY (query) TO STDOUT.
+        Rows never become Python tuples; psycopg2 writes the server's output in chunks.
+        Returns (rows exported, seconds).
+        """
+        if fmt not in self.export_formats:
+            raise ValueError(f"Unknown export format: {fmt}")
 
-        return rows, ms
+        t0 = time.time()
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            try:
+                sql = cur.mogrify(query, params or ())
+                with open(path, "wb") as out:
+                    cur.copy_expert(self.export_formats[fmt].replace(b"{query}", sql), out, size=COPY_BUFFER_SIZE)
+                rows = cur.rowcount
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cur.close()
+
+        return rows, time.time() - t0
+
+    def export_read(self, table_name, path, fmt="csv"):
+        key = self.read_keys[table_name]
+        return self._export(f"{self.read_queries[table_name]} ORDER BY {key}", None, path, fmt)
+
+    def export_search(self, search_name, args, path, fmt="csv"):
+        query, params = self._search_query(search_name, *args)
+        return self._export(query, params, path, fmt)
+
+    # ======== TASK 3: SEARCH ========
+    # the filters are built by the search_*_sql functions of src/queries.py
+
+    def _search_query(self, search_name, *args):
+        return search_query(search_name, *args)
+
+    def _search(self, search_name, *args):
+        query, params = self._search_query(search_name, *args)
+        timing = {}
+
+        def loader():
+            rows, timing["ms"] = self._execute_search(query, params)
+            return rows
 
-    def search_objects(self, lab_like, type_like):
-        sql = """
-            SELECT o.id, o.name, CAST(o.distance AS numeric), l.lab_name, t.type, t.galaxy_location
-            FROM object o
-            JOIN laboratory l ON o.laboratory_id = l.id
-            JOIN object_type t ON o.type_id = t.id
-            WHERE 
-                (%s = '' OR %s = '-' OR l.lab_name LIKE %s)
-            AND 
-                (%s = '' OR %s = '-' OR t.type LIKE %s)
-            ORDER BY o.id;
-        """
         t0 = time.time()
-        cur = self.connection.cursor()
+        rows, hit = self._cached_select((query, tuple(params)), self.search_tables[search_name], loader)
+        ms = (time.time() - t0) * 1000 if hit else timing["ms"]
+        return rows, ms
 
-        args = [
-            lab_like, lab_like, f"%{lab_like}%",
-            type_like, type_like, f"%{type_like}%"
-        ]
+    def search_researchers(self, lab_like, level):
+        return self._search("researchers", lab_like, level)
 
-        cur.execute(sql, args)
-        rows = cur.fetchall()
-        ms = (time.time() - t0) * 1000
-        cur.close()
-        return rows, ms
+    def search_objects(self, lab_like, type_like):
+        return self._search("objects", lab_like, type_like)
 
     def search_labs(self, rname_like, level, obj_like):
-        sql = """
-        SELECT DISTINCT
-            l.id,
-            l.lab_name
-        FROM laboratory l
-        LEFT JOIN researcher r ON r.laboratory_id = l.id
-        LEFT JOIN object o ON o.laboratory_id = l.id
-        WHERE
-            (%s = '' OR %s = '-' OR r.full_name LIKE %s)
-            AND (%s = '' OR %s = '-' OR r.level = %s)
-            AND (%s = '' OR %s = '-' OR o.name LIKE %s)
-        ORDER BY l.id;
-        """
+        return self._search("labs", rname_like, level, obj_like)
 
-        args = [
-            rname_like, rname_like, f"%{rname_like}%",
-            level, level, level,
-            obj_like, obj_like, f"%{obj_like}%"
-        ]
+    def search_objects_by_distance(self, min_distance, max_distance):
+        # objects with min_distance <= distance <= max_distance (light years or "1.3 пк" etc.), nearest first
+        return self._search("distance_range", min_distance, max_distance)
 
-        import time
-        t0 = time.time()
-        cur = self.connection.cursor()
-        cur.execute(sql, args)
-        rows = cur.fetchall()
-        t = (time.time() - t0) * 1000
-        cur.close()
+    def search_nearest_objects(self, distance, k=DEFAULT_NEAREST_K):
+        # the k objects whose distance is closest to the given one
+        return self._search("nearest", distance, k)
 
-        return rows, t
\ No newline at end of file
+    # ======== DIAGNOSTICS ========
+
+    def explain_search(self, search_name, *args):
+        """
+        Reruns a task-3 search under EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON), bypassing
+        the cache. Returns the summary from explain.summarize_explain().
+        Inside a transaction the plan is taken on its connection, so it sees the
+        uncommitted writes, and the transaction is left open.
+        """
+        query, params = self._search_query(search_name, *args)
+        with self._connection() as (conn, tx):
+            cur = conn.cursor()
+            try:
+                cur.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}", params)
+                result = cur.fetchone()[0]
+                if tx is None:
+                    conn.commit()
+            except Exception:
+                if tx is None:
+                    conn.rollback()
+                else:
+                    tx.failed = True
+                raise
+            finally:
+                cur.close()
+        return summarize_explain(result)
+
+    # ======== PAGINATION ========
+
+    def _search_page(self, search_name, args, after_id, limit):
+        builder, key = self.search_builders[search_name]
+        sql, params = builder(*args)
+        if after_id is not None:
+            sql += f" AND {key} > %s"
+            params = [*params, after_id]
+        return self._execute_search(f"{sql} ORDER BY {key} LIMIT %s", [*params, limit])
+
+    def search_researchers_page(self, lab_like, level, after_id=None, limit=DEFAULT_PAGE_SIZE):
+        return self._search_page("researchers", (lab_like, level), after_id, limit)
+
+    def search_objects_page(self, lab_like, type_like, after_id=None, limit=DEFAULT_PAGE_SIZE):
+        return self._search_page("objects", (lab_like, type_like), after_id, limit)
+
+    def search_labs_page(self, rname_like, level, obj_like, after_id=None, limit=DEFAULT_PAGE_SIZE):
+        return self._search_page("labs", (rname_like, level, obj_like), after_id, limit)
+
+    # ======== STREAMING ========
+
+    def read_stream(self, table_name, itersize=DEFAULT_ITERSIZE):
+        return self._execute_stream(self.read_queries[table_name], itersize=itersize)
+
+    def search_stream(self, search_name, *args, itersize=DEFAULT_ITERSIZE):
+        query, params = self._search_query(search_name, *args)
+        return self._execute_stream(query, params, itersize=itersize)
@@ -0,0 +1,162 @@
+from contextlib import contextmanager
+from collections import deque
+import threading
+import time
+
+from psycopg2 import connect, OperationalError, InterfaceError
+from psycopg2.extensions import connection as BaseConnection, TRANSACTION_STATUS_IDLE
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class PooledConnection(BaseConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # names of server-side prepared statements that exist on this session
+        self.prepared = set()
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of psycopg2 connections.
+
+    - keeps between min_size and max_size open connections
+    - checkout blocks (up to timeout seconds) while all connections are busy
+    - a connection that sat idle longer than check_interval is pinged with
+      SELECT 1 before it is handed out; dead connections are replaced
+    """
+
+    def __init__(self, min_size=1, max_size=10, timeout=30.0, check_interval=5.0, **conn_kwargs):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min={min_size}, max={max_size}")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self.conn_kwargs = conn_kwargs
+
+        self._idle = deque()              # (connection, returned_at)
+        self._size = 0                    # open connections (idle + busy)
+        self._lock = threading.Condition()
+        self._closed = False
+
+        for _ in range(min_size):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+
+    # ======== INTERNAL ========
+
+    def _connect(self):
+        return connect(connection_factory=PooledConnection, **self.conn_kwargs)
+
+    @staticmethod
+    def _is_alive(conn) -> bool:
+        if conn.closed:
+            return False
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
+            conn.rollback()
+            return True
+        except (OperationalError, InterfaceError):
+            return False
+
+    @staticmethod
+    def _discard(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    # ======== CHECKOUT / RETURN ========
+
+    def getconn(self):
+        deadline = time.monotonic() + self.timeout
+
+        with self._lock:
+            while True:
+                if self._closed:
+                    raise PoolTimeout("Connection pool is closed")
+
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                    break
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    conn, returned_at = None, None
+                    break
+
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    raise PoolTimeout(f"No free connection in {self.timeout} s (max_size={self.max_size})")
+                self._lock.wait(left)
+
+        # network I/O happens outside the lock
+        try:
+            if conn is None:
+                return self._connect()
+
+            idle_for = time.monotonic() - returned_at
+            if conn.closed or (idle_for >= self.check_interval and not self._is_alive(conn)):
+                self._discard(conn)
+                return self._connect()
+
+            return conn
+        except Exception:
+            with self._lock:
+                self._size -= 1
+                self._lock.notify()
+            raise
+
+    def putconn(self, conn, close=False):
+        # close=True: the caller saw the connection fail, drop it instead of reusing it
+        if close:
+            self._discard(conn)
+        elif not conn.closed and conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            # never hand out a connection in the middle of someone else's transaction
+            try:
+                conn.rollback()
+            except Exception:
+                self._discard(conn)
+
+        with self._lock:
+            if conn.closed or self._closed:
+                self._discard(conn)
+                self._size -= 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._lock.notify()
+
+    @contextmanager
+    def connection(self):
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    # ======== STATS / SHUTDOWN ========
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "busy": self._size - len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+            }
+
+    def closeall(self):
+        with self._lock:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._discard(conn)
+                self._size -= 1
+            self._lock.notify_all()
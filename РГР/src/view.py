@@ -1,5 +1,11 @@
 from typing import Callable, Union
+from itertools import islice
 from tabulate import tabulate
+from .importer import DEFAULT_CATALOGUE_DIR, catalogue_path
+from .queries import DEFAULT_NEAREST_K
+
+# distances are doubles in light years: plain digits up to 12 significant ones, not 1e+09
+DISTANCE_FORMAT = ".12g"
 
 
 class View:
@@ -8,10 +14,14 @@ class View:
         self.available_commands_menus: dict = {
             "create": self.show_menu_create,
             "read": self.show_menu_read,
+            "browse": self.show_menu_browse,
             "update": self.show_menu_update,
             "delete": self.show_menu_delete,
             "task_2": self.show_task2_menu,
             "task_3": self.show_task3_menu,
+            "import": self.show_import_menu,
+            "export": self.show_export_menu,
+            "transaction": self.show_transaction_menu,
             "quit": None,
         }
 
@@ -48,31 +58,95 @@ class View:
             "generate_researchers": self.show_task2_generate_researchers,
             "generate_objects": self.show_task2_generate_objects,
             "generate_object_types": self.show_task2_generate_object_types,
+            "fingerprint": self.show_task2_fingerprint,
         }
 
         self.available_task3: dict = {
             "search_researchers": self.show_task3_search_researchers,
             "search_objects": self.show_task3_search_objects,
             "search_labs": self.show_task3_search_labs,
+            "search_distance_range": self.show_task3_search_distance_range,
+            "search_nearest": self.show_task3_search_nearest,
+            "toggle_explain": self.show_task3_toggle_explain,
+        }
+
+        self.available_import: dict = {
+            "catalogue": self.show_import_catalogue,
+            "laboratory": self.show_import_laboratory,
+            "researcher": self.show_import_researcher,
+            "object": self.show_import_object,
+            "object_type": self.show_import_object_type,
+        }
+
+        self.available_export: dict = {
+            "laboratories": self.show_export_laboratories,
+            "researchers": self.show_export_researchers,
+            "objects": self.show_export_objects,
+            "object_types": self.show_export_object_types,
+            "search_researchers": self.show_export_search_researchers,
+            "search_objects": self.show_export_search_objects,
+            "search_labs": self.show_export_search_labs,
+            "search_distance_range": self.show_export_search_distance_range,
+            "search_nearest": self.show_export_search_nearest,
+        }
+
+        self.available_transaction: dict = {
+            "begin": self.show_transaction_begin,
+            "commit": self.show_transaction_commit,
+            "rollback": self.show_transaction_rollback,
         }
 
         self.table_headers: dict = {
             "laboratories": ("id", "lab_name"),
             "researchers": ("id", "full_name", "level", "laboratory_id"),
-            "objects": ("id", "name", "distance", "laboratory_id", "type", "galaxy_location"),
+            "objects": ("id", "name", "distance (ly)", "laboratory_id", "type", "galaxy_location"),
             "object_types": ("id", "type", "galaxy_location"),
             
         }
 
     # ----------- TABLE OUTPUT -----------
 
-    def output_table(self, table, table_name):
+    @staticmethod
+    def _clean_rows(rows):
+        return [[field.strip() if isinstance(field, str) else field for field in row] for row in rows]
+
+    def output_table(self, table, table_name, chunk_size=None):
+        """
+        Prints rows as a table.
+        With chunk_size the rows may be any iterable (e.g. a streaming generator):
+        they are printed chunk by chunk, so the whole result is never held in memory.
+        """
         print("\n\n")
-        print(
-            tabulate(
-                [[field.strip() if isinstance(field, str) else field for field in row] for row in table],
-                headers=self.table_headers[table_name]
+        if chunk_size is None:
+            print(
+                tabulate(
+                    self._clean_rows(table),
+                    headers=self.table_headers[table_name],
+                    floatfmt=DISTANCE_FORMAT,
+                )
             )
+            return
+
+        rows = iter(table)
+        headers = self.table_headers[table_name]
+        printed = 0
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk and printed:
+                break
+            if printed:
+                print()
+            print(tabulate(self._clean_rows(chunk), headers=headers, floatfmt=DISTANCE_FORMAT))
+            printed += len(chunk)
+            if not chunk:
+                break
+
+    @staticmethod
+    def output_cache_stats(stats):
+        print(
+            f"[CACHE] hits={stats['hits']} misses={stats['misses']} "
+            f"hit rate={stats['hit_rate']:.0%} entries={stats['entries']} "
+            f"size={stats['bytes'] / 1024:.0f} KiB"
         )
 
     @staticmethod
@@ -144,7 +218,7 @@ class View:
     @staticmethod
     def show_create_object():
         name = input("Enter object name: ")
-        distance = input("Enter distance: ")
+        distance = input("Enter distance (light years, or e.g. '8.6 св.р.', '1.3 пк', '10.4 млрд св.р.'): ")
         lab_id = input("Enter laboratory ID: ")
         type_id = input("Enter object_type ID: ")
         return name, distance, lab_id, type_id
@@ -182,6 +256,31 @@ class View:
     def show_read_object_types():
         return "object_types"
 
+    # ----------- BROWSE (PAGES) -----------
+
+    def show_menu_browse(self):
+        self._output_options(
+            self.available_read,
+            amount_of_tabs=1,
+            title="Choose what do you want to browse page by page"
+        )
+        response = self._handle_wrong_input(self.available_read)
+        return response, self._get_key_by_value(self.available_read, response)
+
+    @staticmethod
+    def output_page_info(page_number, rows_on_page):
+        print(f"\n[PAGE {page_number}] {rows_on_page} rows")
+
+    def show_page_navigation(self):
+        navigation_options = {
+            "next_page": "next",
+            "previous_page": "previous",
+            "first_page": "first",
+            "back_to_menu": "quit",
+        }
+        self._output_options(navigation_options, 2, "Navigate")
+        return self._handle_wrong_input(navigation_options)
+
     # ----------- UPDATE -----------
 
     def show_menu_update(self):
@@ -280,6 +379,63 @@ class View:
         response = self._handle_wrong_input(self.available_task2)
         return response, self._get_key_by_value(self.available_task2, response)
 
+    @staticmethod
+    def _input_workers() -> int:
+        while True:
+            raw = input("Enter number of worker processes [1]: ").strip()
+            try:
+                workers = int(raw) if raw else 1
+                assert workers > 0
+                return workers
+            except (ValueError, AssertionError):
+                print("Please input a positive integer.")
+
+    @staticmethod
+    def _input_seed():
+        # None: unseeded, a different dataset every run
+        while True:
+            raw = input("Enter seed for reproducible data [none]: ").strip()
+            try:
+                return int(raw) if raw else None
+            except ValueError:
+                print("Please input an integer or leave empty.")
+
+    @staticmethod
+    def _input_engine() -> str:
+        while True:
+            engine = input("Enter generation engine (sql/numpy) [sql]: ").strip().lower() or "sql"
+            if engine in ("sql", "numpy"):
+                return engine
+            print("Please input sql or numpy.")
+
+    @staticmethod
+    def output_fingerprint(fingerprint: dict):
+        rows = [(table_name, value["rows"], value["hash"])
+                for table_name, value in fingerprint.items() if table_name != "dataset"]
+        print(tabulate(rows, headers=["table", "rows", "hash"], tablefmt="psql"))
+        print(f"[TASK2] Dataset fingerprint: {fingerprint['dataset']}")
+
+    @staticmethod
+    def output_generate_result(table_name: str, created: int, seconds: float):
+        rate = created / seconds if seconds else 0.0
+        print(f"[TASK2] {table_name}: {created} rows in {seconds:.2f} s ({rate:.0f} rows/s)")
+
+    @staticmethod
+    def output_generate_progress(done: int, total: int, rate: float):
+        eta = (total - done) / rate if rate else 0.0
+        percent = done / total * 100 if total else 100.0
+        print(f"\r[TASK2] {done}/{total} rows ({percent:.1f}%), {rate:.0f} rows/s, ETA {eta:.0f} s   ",
+              end="", flush=True)
+
+    @staticmethod
+    def ask_resume_generation(job: dict) -> bool:
+        print(f"Unfinished generation of {job['table_name']}: {job['done']}/{job['total']} rows committed.")
+        while True:
+            answer = input("Resume it? (y/n): ").strip().lower()
+            if answer in ("y", "n"):
+                return answer == "y"
+            print("Please input y or n.")
+
     # viewer functions for each task2 option:
     @staticmethod
     def show_task2_generate_labs():
@@ -287,7 +443,8 @@ class View:
             try:
                 n = int(input("Enter number of laboratory records to generate: ").strip())
                 assert n > 0
-                return n
+                exact = input("Top up until exactly n new laboratories exist? (y/n) [n]: ").strip().lower() == "y"
+                return n, View._input_seed(), exact
             except (ValueError, AssertionError):
                 print("Please input a positive integer.")
 
@@ -297,7 +454,7 @@ class View:
             try:
                 n = int(input("Enter number of researcher records to generate: ").strip())
                 assert n > 0
-                return n
+                return n, View._input_workers(), View._input_seed(), View._input_engine()
             except (ValueError, AssertionError):
                 print("Please input a positive integer.")
 
@@ -307,7 +464,7 @@ class View:
             try:
                 n = int(input("Enter number of object records to generate: ").strip())
                 assert n > 0
-                return n
+                return n, View._input_workers(), View._input_seed(), View._input_engine()
             except (ValueError, AssertionError):
                 print("Please input a positive integer.")
 
@@ -318,10 +475,14 @@ class View:
             try:
                 n = int(input("Enter number of object_type records to generate: ").strip())
                 assert n > 0
-                return n
+                return n, View._input_workers(), View._input_seed(), View._input_engine()
             except (ValueError, AssertionError):
                 print("Please input a positive integer.")
 
+    @staticmethod
+    def show_task2_fingerprint():
+        return None
+
     def show_task3_menu(self):
         self._output_options(
             self.available_task3,
@@ -343,9 +504,183 @@ class View:
         type_name = input("Enter object type pattern (LIKE): ")
         return lab, type_name
 
+    @staticmethod
+    def show_task3_toggle_explain():
+        return None
+
+    @staticmethod
+    def output_explain(summary):
+        print("\n[EXPLAIN ANALYZE]")
+        print(
+            tabulate(
+                [
+                    [
+                        "  " * node["depth"] + node["node"],
+                        node["estimated_rows"],
+                        node["actual_rows"],
+                        f"x{node['estimate_error']:.1f}",
+                        node["shared_hit"],
+                        node["shared_read"],
+                        f"{node['self_ms']:.2f}",
+                    ]
+                    for node in summary["nodes"]
+                ],
+                headers=("node", "est. rows", "actual rows", "error", "buf hit", "buf read", "self ms"),
+            )
+        )
+        dominant = summary["dominant"]
+        print(f"[EXPLAIN] planning {summary['planning_ms']:.2f} ms, execution {summary['execution_ms']:.2f} ms")
+        print(f"[EXPLAIN] dominant node: {dominant['node']} ({dominant['self_ms']:.2f} ms)")
+
     @staticmethod
     def show_task3_search_labs():
         rname = input("Enter researcher name (LIKE) or '-' for all: ").strip()
         level = input("Enter researcher level (Junior/Middle/Senior/Lead) or '-' for all: ").strip()
         obj_name = input("Enter object name (LIKE) or '-' for all: ").strip()
-        return rname, level, obj_name
\ No newline at end of file
+        return rname, level, obj_name
+
+    @staticmethod
+    def show_task3_search_distance_range():
+        min_distance = input("Enter minimum distance (light years, or e.g. '1.3 пк'): ").strip()
+        max_distance = input("Enter maximum distance (light years, or e.g. '10 тис. св.р.'): ").strip()
+        return min_distance, max_distance
+
+    @staticmethod
+    def show_task3_search_nearest():
+        distance = input("Enter distance (light years, or e.g. '1.3 пк'): ").strip()
+        k = input(f"Enter number of objects [{DEFAULT_NEAREST_K}]: ").strip()
+        return distance, int(k) if k.isdigit() else DEFAULT_NEAREST_K
+
+    # ----------- IMPORT (CSV) -----------
+
+    def show_import_menu(self):
+        self._output_options(
+            self.available_import,
+            amount_of_tabs=1,
+            title="Choose what do you want to import"
+        )
+        response = self._handle_wrong_input(self.available_import)
+        return response, self._get_key_by_value(self.available_import, response)
+
+    @staticmethod
+    def _input_path(prompt, default):
+        path = input(f"{prompt} [{default}]: ").strip()
+        return path or default
+
+    def show_import_catalogue(self):
+        return self._input_path("Enter directory with catalogue CSV files", DEFAULT_CATALOGUE_DIR)
+
+    def show_import_laboratory(self):
+        return "laboratory", self._input_path("Enter CSV path", catalogue_path(DEFAULT_CATALOGUE_DIR, "laboratory"))
+
+    def show_import_researcher(self):
+        return "researcher", self._input_path("Enter CSV path", catalogue_path(DEFAULT_CATALOGUE_DIR, "researcher"))
+
+    def show_import_object(self):
+        return "object", self._input_path("Enter CSV path", catalogue_path(DEFAULT_CATALOGUE_DIR, "object"))
+
+    def show_import_object_type(self):
+        return "object_type", self._input_path("Enter CSV path", catalogue_path(DEFAULT_CATALOGUE_DIR, "object_type"))
+
+    @staticmethod
+    def output_batch_summary(stats):
+        seconds = stats["seconds"]
+        rate = stats["commands"] / seconds if seconds > 0 else 0
+        print(f"[BATCH] {stats['commands']} commands in {seconds:.2f} s ({rate:,.0f} commands/s): "
+              f"{stats['ok']} ok, {stats['failed']} failed")
+        if stats["transactions"]:
+            print(f"[BATCH] {stats['writes']} writes in {stats['transactions']} transactions, "
+                  f"{stats['rolled_back']} rolled back")
+
+    @staticmethod
+    def output_import_result(table_name, rows, seconds):
+        rate = rows / seconds if seconds > 0 else 0
+        print(f"[IMPORT] {table_name}: {rows} rows in {seconds:.2f} s ({rate:,.0f} rows/s)")
+
+    # ----------- EXPORT (CSV / JSON lines) -----------
+
+    def show_export_menu(self):
+        self._output_options(
+            self.available_export,
+            amount_of_tabs=1,
+            title="Choose what do you want to export"
+        )
+        response = self._handle_wrong_input(self.available_export)
+        return response, self._get_key_by_value(self.available_export, response)
+
+    def _input_export_target(self, name):
+        format_options = {
+            "csv": "csv",
+            "json_lines": "jsonl",
+        }
+        self._output_options(format_options, 2, "Choose file format")
+        fmt = self._handle_wrong_input(format_options)
+        path = self._input_path("Enter output file", f"{name}.{fmt}")
+        return path, fmt
+
+    def show_export_laboratories(self):
+        return "laboratories", *self._input_export_target("laboratories")
+
+    def show_export_researchers(self):
+        return "researchers", *self._input_export_target("researchers")
+
+    def show_export_objects(self):
+        return "objects", *self._input_export_target("objects")
+
+    def show_export_object_types(self):
+        return "object_types", *self._input_export_target("object_types")
+
+    def show_export_search_researchers(self):
+        return "researchers", self.show_task3_search_researchers(), *self._input_export_target("search_researchers")
+
+    def show_export_search_objects(self):
+        return "objects", self.show_task3_search_objects(), *self._input_export_target("search_objects")
+
+    def show_export_search_labs(self):
+        return "labs", self.show_task3_search_labs(), *self._input_export_target("search_labs")
+
+    def show_export_search_distance_range(self):
+        return "distance_range", self.show_task3_search_distance_range(), *self._input_export_target("search_distance_range")
+
+    def show_export_search_nearest(self):
+        return "nearest", self.show_task3_search_nearest(), *self._input_export_target("search_nearest")
+
+    @staticmethod
+    def output_export_result(path, rows, seconds):
+        rate = rows / seconds if seconds > 0 else 0
+        print(f"[EXPORT] {rows} rows written to {path} in {seconds:.2f} s ({rate:,.0f} rows/s)")
+
+    # ----------- TRANSACTION (unit of work) -----------
+
+    def show_transaction_menu(self):
+        self._output_options(
+            self.available_transaction,
+            amount_of_tabs=1,
+            title="Transaction: group the next operations into one commit"
+        )
+        response = self._handle_wrong_input(self.available_transaction)
+        return response, self._get_key_by_value(self.available_transaction, response)
+
+    @staticmethod
+    def show_transaction_begin():
+        return None
+
+    @staticmethod
+    def show_transaction_commit():
+        return None
+
+    @staticmethod
+    def show_transaction_rollback():
+        return None
+
+    @staticmethod
+    def output_transaction_state(state, writes=0):
+        messages = {
+            "begin": "[TRANSACTION] Started: changes are committed only on 'commit'",
+            "commit": f"[TRANSACTION] Committed {writes} writes",
+            "failed": f"[TRANSACTION] A statement failed: all {writes} writes were rolled back",
+            "rollback": f"[TRANSACTION] Rolled back {writes} writes",
+            "open": "[TRANSACTION] A transaction is already open",
+            "none": "[TRANSACTION] No open transaction",
+        }
+        print(messages[state])
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the code is imported as the package "src", as crud.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,89 @@
+import pytest
+
+from src import cache as cache_module
+from src.cache import QueryCache, estimate_size
+
+
+def put(cache, key, rows, tables=("laboratory",)):
+    cache.put(key, rows, tables, cache.version(tables))
+
+
+def test_miss_then_hit():
+    cache = QueryCache()
+    assert cache.get("q") == (False, None)
+    put(cache, "q", [(1, "a")])
+    assert cache.get("q") == (True, [(1, "a")])
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_hits_are_copies():
+    cache = QueryCache()
+    rows = [(1, "a")]
+    put(cache, "q", rows)
+    rows.append((2, "b"))
+    _, hit = cache.get("q")
+    hit.clear()
+    assert cache.get("q") == (True, [(1, "a")])
+
+
+def test_lru_eviction_by_size():
+    rows = [(1, "a")]
+    cache = QueryCache(max_bytes=estimate_size(rows) * 2)
+    put(cache, "a", rows)
+    put(cache, "b", rows)
+    cache.get("a")                      # "b" is now the least recently used
+    put(cache, "c", rows)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a")[0] and cache.get("c")[0]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_result_larger_than_the_cache_is_not_stored():
+    cache = QueryCache(max_bytes=10)
+    put(cache, "q", [(1, "a")])
+    assert cache.stats()["entries"] == 0
+
+
+def test_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = QueryCache(ttl=60)
+    put(cache, "q", [(1,)])
+    now[0] += 59
+    assert cache.get("q")[0]
+    now[0] += 2
+    assert cache.get("q") == (False, None)
+    assert cache.stats()["entries"] == 0
+
+
+def test_invalidate_drops_dependent_entries_only():
+    cache = QueryCache()
+    put(cache, "labs", [(1,)], ("laboratory",))
+    put(cache, "researchers", [(1,)], ("researcher", "laboratory"))
+    put(cache, "types", [(1,)], ("object_type",))
+    cache.invalidate(("laboratory",))
+    assert cache.get("labs")[0] is False
+    assert cache.get("researchers")[0] is False
+    assert cache.get("types")[0] is True
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_result_read_during_a_write_is_not_stored():
+    cache = QueryCache()
+    version = cache.version(("laboratory",))
+    cache.invalidate(("laboratory",))
+    cache.put("q", [(1,)], ("laboratory",), version)
+    assert cache.get("q") == (False, None)
+
+
+def test_disabled_cache_stores_nothing():
+    cache = QueryCache(max_bytes=0)
+    assert not cache.enabled
+    put(cache, "q", [(1,)])
+    assert cache.get("q") == (False, None)
+
+
+@pytest.mark.parametrize("rows", [[], [(1, "a")], [(1, "a"), (2, "bb")]])
+def test_estimate_size_grows_with_rows(rows):
+    assert estimate_size(rows + [(3, "ccc")]) > estimate_size(rows)
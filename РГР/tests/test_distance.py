@@ -0,0 +1,35 @@
+import pytest
+
+from src.distance import LIGHT_YEARS_PER_PARSEC, parse_distance, parse_distances
+
+
+@pytest.mark.parametrize("value, expected", [
+    (42, 42.0),
+    (4.2, 4.2),
+    ("8.6", 8.6),
+    ("8,6", 8.6),
+    ("~8.6 св.р.", 8.6),
+    ("≈ 8.6 св. р.", 8.6),
+    ("~10 000 св.р.", 10_000.0),
+    ("5 тис. св.р.", 5_000.0),
+    ("2.5 млн св.р.", 2_500_000.0),
+    ("~10.4 млрд св.р.", 10.4e9),
+    ("1.3 пк", 1.3 * LIGHT_YEARS_PER_PARSEC),
+    ("1 МЛН ПК", 1e6 * LIGHT_YEARS_PER_PARSEC),
+])
+def test_parse_distance(value, expected):
+    assert parse_distance(value) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("value", ["", "далеко", "св.р.", "-5", "1.3 км", "10 000 000 000 000 млрд млн"])
+def test_parse_distance_rejects_unknown_spellings(value):
+    with pytest.raises(ValueError):
+        parse_distance(value)
+
+
+def test_parse_distance_memo_returns_the_same_value():
+    assert parse_distance("~7 тис. св.р.") == parse_distance("~7 тис. св.р.") == 7000.0
+
+
+def test_parse_distances():
+    assert parse_distances(["1", "~2 тис. св.р.", 3]) == [1.0, 2000.0, 3.0]
@@ -0,0 +1,73 @@
+import pytest
+
+from src.explain import flatten_plan, summarize_explain
+
+PLAN = [{
+    "Plan": {
+        "Node Type": "Nested Loop",
+        "Plan Rows": 10,
+        "Actual Rows": 10,
+        "Actual Loops": 1,
+        "Actual Total Time": 5.0,
+        "Shared Hit Blocks": 30,
+        "Plans": [
+            {
+                "Node Type": "Seq Scan",
+                "Relation Name": "laboratory",
+                "Alias": "l",
+                "Plan Rows": 1,
+                "Actual Rows": 100,
+                "Actual Loops": 1,
+                "Actual Total Time": 1.0,
+                "Shared Read Blocks": 4,
+            },
+            {
+                "Node Type": "Index Scan",
+                "Relation Name": "object",
+                "Alias": "object",
+                "Index Name": "object_pkey",
+                "Plan Rows": 1,
+                "Actual Rows": 1,
+                "Actual Loops": 10,
+                "Actual Total Time": 0.3,
+            },
+        ],
+    },
+    "Planning Time": 0.2,
+    "Execution Time": 5.1,
+}]
+
+
+def test_flatten_plan_labels_and_depths():
+    nodes = flatten_plan(PLAN[0]["Plan"])
+    assert [(node["depth"], node["node"]) for node in nodes] == [
+        (0, "Nested Loop"),
+        (1, "Seq Scan on laboratory l"),
+        (1, "Index Scan on object using object_pkey"),
+    ]
+
+
+def test_loops_multiply_rows_and_time():
+    index_scan = flatten_plan(PLAN[0]["Plan"])[2]
+    assert index_scan["actual_rows"] == 10
+    assert index_scan["estimated_rows"] == 10
+    assert index_scan["total_ms"] == pytest.approx(3.0)
+
+
+def test_self_time_excludes_children():
+    root = flatten_plan(PLAN[0]["Plan"])[0]
+    assert root["self_ms"] == pytest.approx(5.0 - 1.0 - 3.0)
+
+
+def test_estimate_error_is_a_factor_both_ways():
+    seq_scan = flatten_plan(PLAN[0]["Plan"])[1]
+    assert seq_scan["estimate_error"] == pytest.approx(100)
+    assert seq_scan["shared_read"] == 4
+
+
+def test_summarize_explain():
+    summary = summarize_explain(PLAN)
+    assert summary["planning_ms"] == 0.2
+    assert summary["execution_ms"] == 5.1
+    assert summary["dominant"]["node"] == "Index Scan on object using object_pkey"
+    assert len(summary["nodes"]) == 3
@@ -0,0 +1,21 @@
+from src.generation import chunk_seed, plan_chunks
+
+
+def test_plan_chunks_covers_total():
+    assert plan_chunks(10, 4) == [(0, 4), (1, 4), (2, 2)]
+    assert plan_chunks(8, 4) == [(0, 4), (1, 4)]
+    assert plan_chunks(3, 10) == [(0, 3)]
+    assert plan_chunks(0, 10) == []
+
+
+def test_chunk_seed_is_deterministic_and_in_range():
+    seeds = [chunk_seed(42, "object", first_id) for first_id in (1, 50_001, 100_001)]
+    assert seeds == [chunk_seed(42, "object", first_id) for first_id in (1, 50_001, 100_001)]
+    assert all(-1 <= seed <= 1 for seed in seeds)
+
+
+def test_chunk_seed_depends_on_every_input():
+    base = chunk_seed(42, "object", 1)
+    assert chunk_seed(43, "object", 1) != base
+    assert chunk_seed(42, "researcher", 1) != base
+    assert chunk_seed(42, "object", 2) != base
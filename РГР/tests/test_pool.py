@@ -0,0 +1,157 @@
+import pytest
+from psycopg2 import OperationalError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS
+
+from src.pool import ConnectionPool, PoolTimeout
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, args=None):
+        if self.conn.dead:
+            raise OperationalError("server closed the connection unexpectedly")
+        self.conn.executed.append(sql)
+
+    def fetchone(self):
+        return (self.conn.result,)
+
+    def close(self):
+        pass
+
+
+class FakeInfo:
+    transaction_status = TRANSACTION_STATUS_IDLE
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.dead = False          # the server side went away
+        self.executed = []
+        self.result = None         # what fetchone() returns
+        self.commits = 0
+        self.rollbacks = 0
+        self.info = FakeInfo()
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        if self.dead:
+            raise OperationalError("server closed the connection unexpectedly")
+        self.commits += 1
+        self.info.transaction_status = TRANSACTION_STATUS_IDLE
+
+    def rollback(self):
+        if self.dead:
+            raise OperationalError("server closed the connection unexpectedly")
+        self.rollbacks += 1
+        self.info.transaction_status = TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+class FakePool(ConnectionPool):
+    # opens FakeConnection objects instead of connecting to a server
+    def __init__(self, **kwargs):
+        self.opened = []
+        super().__init__(**kwargs)
+
+    def _connect(self):
+        conn = FakeConnection()
+        self.opened.append(conn)
+        return conn
+
+
+def test_invalid_sizes():
+    with pytest.raises(ValueError):
+        FakePool(min_size=3, max_size=2)
+    with pytest.raises(ValueError):
+        FakePool(min_size=0, max_size=0)
+
+
+def test_checkout_and_return_reuse_the_connection():
+    pool = FakePool(min_size=1, max_size=2)
+    conn = pool.getconn()
+    assert conn is pool.opened[0]
+    assert pool.stats()["busy"] == 1
+    pool.putconn(conn)
+    assert pool.stats() == {"size": 1, "idle": 1, "busy": 0, "min_size": 1, "max_size": 2}
+    with pool.connection() as again:
+        assert again is conn
+    assert len(pool.opened) == 1
+
+
+def test_putconn_rolls_back_an_open_transaction():
+    pool = FakePool(min_size=1, max_size=1)
+    conn = pool.getconn()
+    conn.info.transaction_status = TRANSACTION_STATUS_INTRANS
+    pool.putconn(conn)
+    assert conn.rollbacks == 1
+    assert pool.getconn() is conn
+
+
+def test_closed_connection_is_dropped_on_return():
+    pool = FakePool(min_size=0, max_size=1)
+    conn = pool.getconn()
+    conn.close()
+    pool.putconn(conn)
+    assert pool.stats()["size"] == 0
+    assert pool.getconn() is not conn
+
+
+def test_putconn_close_drops_the_connection():
+    pool = FakePool(min_size=1, max_size=1)
+    conn = pool.getconn()
+    pool.putconn(conn, close=True)
+    assert conn.closed
+    assert pool.stats()["size"] == 0
+    assert pool.getconn() is not conn
+
+
+def test_timeout_when_all_connections_are_busy():
+    pool = FakePool(min_size=0, max_size=2, timeout=0.05)
+    first, second = pool.getconn(), pool.getconn()
+    assert pool.stats()["size"] == 2
+    with pytest.raises(PoolTimeout):
+        pool.getconn()
+    pool.putconn(second)
+    assert pool.getconn() is second
+    pool.putconn(first)
+
+
+def test_idle_connection_is_pinged_and_replaced_when_dead():
+    pool = FakePool(min_size=0, max_size=1, check_interval=0)
+    conn = pool.getconn()
+    pool.putconn(conn)
+    assert pool.getconn() is conn
+    assert conn.executed == ["SELECT 1"]
+    pool.putconn(conn)
+
+    conn.dead = True
+    fresh = pool.getconn()
+    assert fresh is not conn and conn.closed
+    assert pool.stats()["size"] == 1
+
+
+def test_recently_used_connection_is_not_pinged():
+    pool = FakePool(min_size=1, max_size=1, check_interval=60)
+    conn = pool.getconn()
+    pool.putconn(conn)
+    assert pool.getconn() is conn
+    assert conn.executed == []
+
+
+def test_closeall():
+    pool = FakePool(min_size=2, max_size=3)
+    busy = pool.getconn()
+    pool.closeall()
+    assert [conn.closed for conn in pool.opened] == [1, 0]     # the idle one
+    with pytest.raises(PoolTimeout):
+        pool.getconn()
+    pool.putconn(busy)
+    assert busy.closed
+    assert pool.stats()["size"] == 0
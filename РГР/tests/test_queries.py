@@ -0,0 +1,73 @@
+import pytest
+
+from src.distance import LIGHT_YEARS_PER_PARSEC
+from src.queries import (
+    search_distance_range_sql, search_labs_sql, search_nearest_sql, search_objects_sql, search_query,
+    search_researchers_sql,
+)
+
+
+def squash(sql):
+    return " ".join(sql.split())
+
+
+def test_wildcards_add_no_filters():
+    sql, args = search_researchers_sql("-", "-")
+    assert "WHERE TRUE" in squash(sql) and args == []
+    sql, args = search_objects_sql("", "-")
+    assert "WHERE TRUE" in squash(sql) and args == []
+    sql, args = search_labs_sql("-", "", "-")
+    assert "EXISTS" not in sql and args == []
+
+
+def test_active_filters_are_bare_likes():
+    # "col LIKE %s" alone, so the trigram index can serve it
+    sql, args = search_objects_sql("AB", "Зоря")
+    assert "WHERE l.lab_name LIKE %s AND t.type LIKE %s" in squash(sql)
+    assert args == ["%AB%", "%Зоря%"]
+    assert "= '-'" not in sql
+
+
+def test_researchers_level_is_an_equality():
+    sql, args = search_researchers_sql("-", "Lead")
+    assert "WHERE r.level = %s" in squash(sql)
+    assert args == ["Lead"]
+
+
+def test_labs_filters_become_semi_joins():
+    sql, args = search_labs_sql("Карл", "Lead", "Сіріус")
+    flat = squash(sql)
+    assert flat.count("EXISTS") == 2
+    assert "r.full_name LIKE %s AND r.level = %s" in flat
+    assert "o.name LIKE %s" in flat
+    assert args == ["%Карл%", "Lead", "%Сіріус%"]
+    assert sql.count("%s") == len(args)
+
+
+def test_distance_range_parses_units():
+    sql, args = search_distance_range_sql("1 пк", "10 тис. св.р.")
+    assert "o.distance BETWEEN %s AND %s" in squash(sql)
+    assert args == [pytest.approx(LIGHT_YEARS_PER_PARSEC), 10_000.0]
+
+
+def test_distance_range_rejects_empty_range():
+    with pytest.raises(ValueError):
+        search_distance_range_sql(1000, 100)
+
+
+def test_nearest_parameters_match_placeholders():
+    sql, args = search_nearest_sql("4.2", 5)
+    assert sql.count("%s") == len(args)
+    assert args == [4.2, 4.2, 5, 4.2, 5, 5]
+
+
+def test_nearest_rejects_non_positive_k():
+    with pytest.raises(ValueError):
+        search_nearest_sql(4.2, 0)
+
+
+def test_search_query_appends_order_by_key():
+    sql, args = search_query("researchers", "-", "-")
+    assert squash(sql).endswith("ORDER BY r.id")
+    sql, _ = search_query("distance_range", 1, 2)
+    assert squash(sql).endswith("ORDER BY o.distance, o.id")
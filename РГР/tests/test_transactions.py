@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+from psycopg2 import OperationalError
+
+from src.cache import QueryCache
+from src.model import Model
+from test_pool import FakePool
+from test_explain import PLAN
+
+
+@pytest.fixture
+def model():
+    # begin / commit / rollback only touch the pool, so skip __init__ and use fake connections
+    model = Model.__new__(Model)
+    model.pool = FakePool(min_size=1, max_size=1)
+    model.cache = QueryCache()
+    model._local = threading.local()
+    return model
+
+
+def test_commit_returns_the_connection(model):
+    tx = model.begin()
+    assert model.commit() is True
+    assert not model.in_transaction()
+    assert model.pool.stats()["idle"] == 1
+    assert model.pool.getconn() is tx.conn
+
+
+def test_failed_commit_closes_the_connection(model):
+    model.cache.put("labs", [(1,)], ("laboratory",), model.cache.version(("laboratory",)))
+    tx = model.begin()
+    tx.tables.add("laboratory")
+    tx.conn.dead = True
+    with pytest.raises(OperationalError):
+        model.commit()
+    assert not tx.committed and not model.in_transaction()
+    assert tx.conn.closed
+    assert model.pool.stats()["size"] == 0
+    assert model.pool.getconn() is not tx.conn
+    assert model.cache.get("labs")[0]       # nothing was written
+
+
+def test_failed_rollback_closes_the_connection(model):
+    tx = model.begin()
+    tx.conn.dead = True
+    with pytest.raises(OperationalError):
+        model.rollback()
+    assert tx.conn.closed
+    assert model.pool.stats()["size"] == 0
+
+
+def test_transaction_block_rolls_back_on_error(model):
+    with pytest.raises(ValueError):
+        with model.transaction() as tx:
+            raise ValueError("boom")
+    assert tx.failed and not tx.committed
+    assert tx.conn.rollbacks == 1
+    assert model.pool.stats()["idle"] == 1
+
+
+def test_explain_runs_in_the_open_transaction(model, monkeypatch):
+    monkeypatch.setattr(model, "_search_query", lambda *args: ("SELECT 1", []))
+    with model.transaction() as tx:
+        tx.conn.result = PLAN
+        summary = model.explain_search("labs", "-", "-", "-")
+        assert tx.conn.executed == ["EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) SELECT 1"]
+        assert tx.conn.commits == 0 and model.in_transaction()
+    assert summary["execution_ms"] == 5.1
+    assert tx.committed and tx.conn.commits == 1
+
+
+def test_failed_explain_fails_the_transaction(model, monkeypatch):
+    monkeypatch.setattr(model, "_search_query", lambda *args: ("SELECT 1", []))
+    with model.transaction() as tx:
+        tx.conn.dead = True
+        with pytest.raises(OperationalError):
+            model.explain_search("labs", "-", "-", "-")
+        assert tx.failed
+        tx.conn.dead = False
+    assert not tx.committed and tx.conn.rollbacks == 1
@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.vector_generation import build_chunk
+
+
+def test_seeded_chunk_is_reproducible():
+    first = build_chunk("researcher", ([1, 2, 3],), 10, 50, seed=7)
+    assert first == build_chunk("researcher", ([1, 2, 3],), 10, 50, seed=7)
+    assert first != build_chunk("researcher", ([1, 2, 3],), 10, 50, seed=8)
+    assert first.count(b"\n") == 50
+
+
+@pytest.mark.parametrize("seed", [-1, -42, -2 ** 40])
+def test_negative_seed(seed):
+    chunk = build_chunk("object", ([1], [2]), 1, 20, seed=seed)
+    assert chunk == build_chunk("object", ([1], [2]), 1, 20, seed=seed)
+    assert chunk != build_chunk("object", ([1], [2]), 1, 20, seed=-seed)
+
+
+def test_rows_follow_the_columns():
+    rows = build_chunk("object", ([5], [9]), 100, 3, seed=1).decode().splitlines()
+    assert [row.split("\t")[0] for row in rows] == ["100", "101", "102"]
+    for row in rows:
+        _, name, distance, lab_id, type_id = row.split("\t")
+        assert len(name) == 5 and name.isupper()
+        assert 1000 <= int(distance) <= 1_000_000_000
+        assert (lab_id, type_id) == ("5", "9")
@@ -16,7 +16,7 @@ CREATE TABLE IF NOT EXISTS public.object
 (
     id integer NOT NULL,
     name character varying(50) NOT NULL,
-    distance character varying(50) NOT NULL,
+    distance double precision NOT NULL,
     laboratory_id integer NOT NULL,
     type_id integer NOT NULL,
     PRIMARY KEY (id)
@@ -37,6 +37,10 @@ CREATE TABLE IF NOT EXISTS public.labolatory
     PRIMARY KEY (id)
 );
 
+-- distance is in light years; range / nearest-distance queries use this index
+CREATE INDEX IF NOT EXISTS object_distance_idx
+    ON public.object (distance);
+
 ALTER TABLE IF EXISTS public.researcher
     ADD FOREIGN KEY (laboratory_id)
     REFERENCES public.labolatory (id) MATCH SIMPLE